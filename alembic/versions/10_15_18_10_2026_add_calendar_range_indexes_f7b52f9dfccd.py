@@ -0,0 +1,31 @@
+"""add calendar range indexes
+
+Revision ID: f7b52f9dfccd
+Revises: 77e61666f7a2
+Create Date: 2026-10-18 10:15:42.118204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7b52f9dfccd'
+down_revision: Union[str, Sequence[str], None] = '77e61666f7a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_task_company_executor_period', 'task', ['company_id', 'executor_id', 'start_at', 'end_at'], unique=False
+    )
+    op.create_index('ix_meeting_company_period', 'meeting', ['company_id', 'start_at', 'end_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_meeting_company_period', table_name='meeting')
+    op.drop_index('ix_task_company_executor_period', table_name='task')
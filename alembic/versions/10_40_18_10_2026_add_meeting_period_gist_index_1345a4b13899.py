@@ -0,0 +1,31 @@
+"""add meeting period gist index
+
+Revision ID: 1345a4b13899
+Revises: f7b52f9dfccd
+Create Date: 2026-10-18 10:40:07.530911
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '1345a4b13899'
+down_revision: Union[str, Sequence[str], None] = 'f7b52f9dfccd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_meeting_period', 'meeting', [sa.text('tsrange(start_at, end_at)')], postgresql_using='gist')
+    op.create_index(op.f('ix_meetingattendee_user_id'), 'meetingattendee', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_meetingattendee_user_id'), table_name='meetingattendee')
+    op.drop_index('ix_meeting_period', table_name='meeting', postgresql_using='gist')
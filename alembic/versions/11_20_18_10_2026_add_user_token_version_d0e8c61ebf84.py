@@ -0,0 +1,29 @@
+"""add user token version
+
+Revision ID: d0e8c61ebf84
+Revises: 1345a4b13899
+Create Date: 2026-10-18 11:20:31.804417
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'd0e8c61ebf84'
+down_revision: Union[str, Sequence[str], None] = '1345a4b13899'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('user', sa.Column('token_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('user', 'token_version')
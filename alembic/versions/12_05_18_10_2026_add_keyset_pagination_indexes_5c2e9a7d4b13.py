@@ -0,0 +1,31 @@
+"""add keyset pagination indexes
+
+Revision ID: 5c2e9a7d4b13
+Revises: d0e8c61ebf84
+Create Date: 2026-10-18 12:05:17.402356
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '5c2e9a7d4b13'
+down_revision: Union[str, Sequence[str], None] = 'd0e8c61ebf84'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_task_company_id', 'task', ['company_id', 'id'], unique=False)
+    op.create_index('ix_taskcomment_task_id', 'taskcomment', ['task_id', 'id'], unique=False)
+    op.create_index('ix_companynews_company_id', 'companynews', ['company_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_companynews_company_id', table_name='companynews')
+    op.drop_index('ix_taskcomment_task_id', table_name='taskcomment')
+    op.drop_index('ix_task_company_id', table_name='task')
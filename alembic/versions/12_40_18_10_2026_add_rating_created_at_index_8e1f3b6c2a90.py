@@ -0,0 +1,27 @@
+"""add rating created_at index
+
+Revision ID: 8e1f3b6c2a90
+Revises: 5c2e9a7d4b13
+Create Date: 2026-10-18 12:40:08.517233
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '8e1f3b6c2a90'
+down_revision: Union[str, Sequence[str], None] = '5c2e9a7d4b13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_rating_created_at'), 'rating', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_rating_created_at'), table_name='rating')
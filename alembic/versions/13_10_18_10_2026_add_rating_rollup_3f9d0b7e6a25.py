@@ -0,0 +1,65 @@
+"""add rating rollup
+
+Revision ID: 3f9d0b7e6a25
+Revises: 8e1f3b6c2a90
+Create Date: 2026-10-18 13:10:44.925117
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9d0b7e6a25'
+down_revision: Union[str, Sequence[str], None] = '8e1f3b6c2a90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'ratingrollup',
+        sa.Column('company_id', sa.Integer(), nullable=False),
+        sa.Column('department_id', sa.Integer(), nullable=True),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('year', sa.SmallInteger(), nullable=False),
+        sa.Column('quarter', sa.SmallInteger(), nullable=False),
+        sa.Column('total', sa.Float(), server_default='0', nullable=False),
+        sa.Column('count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['company_id'], ['company.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['department_id'], ['department.id'], ondelete='SET NULL'),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint(
+            'company_id',
+            'department_id',
+            'user_id',
+            'year',
+            'quarter',
+            name='unique_rating_rollup',
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+    op.execute(
+        """
+        INSERT INTO ratingrollup (company_id, department_id, user_id, year, quarter, total, count)
+        SELECT task.company_id, usercompanymembership.department_id, task.executor_id,
+               extract(year FROM rating.created_at), extract(quarter FROM rating.created_at),
+               sum(rating.avg), count(*)
+        FROM rating
+        JOIN task ON task.id = rating.task_id
+        JOIN usercompanymembership
+          ON usercompanymembership.user_id = task.executor_id AND usercompanymembership.company_id = task.company_id
+        GROUP BY 1, 2, 3, 4, 5
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('ratingrollup')
@@ -0,0 +1,56 @@
+"""add department closure
+
+Revision ID: 6b4c1e8f2d37
+Revises: 3f9d0b7e6a25
+Create Date: 2026-10-18 13:45:29.310582
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '6b4c1e8f2d37'
+down_revision: Union[str, Sequence[str], None] = '3f9d0b7e6a25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'departmentclosure',
+        sa.Column('ancestor_id', sa.Integer(), nullable=False),
+        sa.Column('descendant_id', sa.Integer(), nullable=False),
+        sa.Column('depth', sa.Integer(), nullable=False),
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['ancestor_id'], ['department.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['descendant_id'], ['department.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('ancestor_id', 'descendant_id', name='unique_department_closure'),
+    )
+    op.create_index('ix_departmentclosure_descendant_id', 'departmentclosure', ['descendant_id', 'depth'], unique=False)
+    op.execute(
+        """
+        WITH RECURSIVE tree (ancestor_id, descendant_id, depth) AS (
+            SELECT id, id, 0 FROM department
+            UNION ALL
+            SELECT tree.ancestor_id, department.id, tree.depth + 1
+            FROM tree JOIN department ON department.parent_id = tree.descendant_id
+        ) CYCLE descendant_id SET is_cycle USING path
+        INSERT INTO departmentclosure (ancestor_id, descendant_id, depth)
+        SELECT DISTINCT ON (ancestor_id, descendant_id) ancestor_id, descendant_id, depth
+        FROM tree
+        WHERE NOT is_cycle
+        ORDER BY ancestor_id, descendant_id, depth
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_departmentclosure_descendant_id', table_name='departmentclosure')
+    op.drop_table('departmentclosure')
@@ -0,0 +1,63 @@
+"""add manager closure
+
+Revision ID: 9a7e5d3c1f48
+Revises: 6b4c1e8f2d37
+Create Date: 2026-10-18 14:20:51.664870
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '9a7e5d3c1f48'
+down_revision: Union[str, Sequence[str], None] = '6b4c1e8f2d37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'managerclosure',
+        sa.Column('company_id', sa.Integer(), nullable=False),
+        sa.Column('ancestor_id', sa.Integer(), nullable=False),
+        sa.Column('descendant_id', sa.Integer(), nullable=False),
+        sa.Column('depth', sa.Integer(), nullable=False),
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['company_id'], ['company.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['ancestor_id'], ['user.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['descendant_id'], ['user.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('company_id', 'ancestor_id', 'descendant_id', name='unique_manager_closure'),
+    )
+    op.create_index(
+        'ix_managerclosure_descendant_id', 'managerclosure', ['company_id', 'descendant_id', 'depth'], unique=False
+    )
+    op.execute(
+        """
+        WITH RECURSIVE chain (company_id, ancestor_id, descendant_id, depth) AS (
+            SELECT company_id, user_id, user_id, 0 FROM usercompanymembership
+            UNION ALL
+            SELECT chain.company_id, chain.ancestor_id, usercompanymembership.user_id, chain.depth + 1
+            FROM chain
+            JOIN usercompanymembership
+              ON usercompanymembership.company_id = chain.company_id
+             AND usercompanymembership.manager_id = chain.descendant_id
+        ) CYCLE descendant_id SET is_cycle USING path
+        INSERT INTO managerclosure (company_id, ancestor_id, descendant_id, depth)
+        SELECT DISTINCT ON (company_id, ancestor_id, descendant_id) company_id, ancestor_id, descendant_id, depth
+        FROM chain
+        WHERE NOT is_cycle
+        ORDER BY company_id, ancestor_id, descendant_id, depth
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_managerclosure_descendant_id', table_name='managerclosure')
+    op.drop_table('managerclosure')
@@ -0,0 +1,49 @@
+"""add mail outbox
+
+Revision ID: 4d2a8f1c7e63
+Revises: 9a7e5d3c1f48
+Create Date: 2026-10-18 15:05:12.408317
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '4d2a8f1c7e63'
+down_revision: Union[str, Sequence[str], None] = '9a7e5d3c1f48'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'mailoutbox',
+        sa.Column('recipient', sa.String(length=320), nullable=False),
+        sa.Column('subject', sa.String(length=255), nullable=False),
+        sa.Column('body', sa.Text(), nullable=False),
+        sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+        sa.Column('sent_at', sa.DateTime(), nullable=True),
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_mailoutbox_pending',
+        'mailoutbox',
+        ['next_attempt_at'],
+        unique=False,
+        postgresql_where=sa.text('sent_at IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_mailoutbox_pending', table_name='mailoutbox', postgresql_where=sa.text('sent_at IS NULL'))
+    op.drop_table('mailoutbox')
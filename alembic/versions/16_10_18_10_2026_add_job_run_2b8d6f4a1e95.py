@@ -0,0 +1,42 @@
+"""add job run
+
+Revision ID: 2b8d6f4a1e95
+Revises: 7c3e1a9b5d20
+Create Date: 2026-10-18 16:10:44.562091
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '2b8d6f4a1e95'
+down_revision: Union[str, Sequence[str], None] = '7c3e1a9b5d20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'jobrun',
+        sa.Column('job_id', sa.String(length=100), nullable=False),
+        sa.Column('status', sa.Enum('RUNNING', 'SUCCESS', 'FAILED', name='jobstatus'), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=False),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.Column('duration', sa.Float(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_jobrun_job_id_started_at', 'jobrun', ['job_id', 'started_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_jobrun_job_id_started_at', table_name='jobrun')
+    op.drop_table('jobrun')
+    sa.Enum(name='jobstatus').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,56 @@
+"""persist invite import rows
+
+Revision ID: 5e9c2d7b3a14
+Revises: 2b8d6f4a1e95
+Create Date: 2026-10-18 17:20:06.318452
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '5e9c2d7b3a14'
+down_revision: Union[str, Sequence[str], None] = '2b8d6f4a1e95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'inviteimport',
+        sa.Column('items', postgresql.JSONB(astext_type=sa.Text()), server_default='[]', nullable=False),
+    )
+    op.add_column('inviteimport', sa.Column('position', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('inviteimport', sa.Column('lease_until', sa.DateTime(), nullable=True))
+    op.create_index(
+        'ix_inviteimport_pending',
+        'inviteimport',
+        ['created_at'],
+        unique=False,
+        postgresql_where=sa.text("status IN ('PENDING', 'RUNNING')"),
+    )
+    op.execute(
+        """
+        UPDATE inviteimport
+        SET status = 'FAILED', finished_at = now()
+        WHERE status IN ('PENDING', 'RUNNING')
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        'ix_inviteimport_pending',
+        table_name='inviteimport',
+        postgresql_where=sa.text("status IN ('PENDING', 'RUNNING')"),
+    )
+    op.drop_column('inviteimport', 'lease_until')
+    op.drop_column('inviteimport', 'position')
+    op.drop_column('inviteimport', 'items')
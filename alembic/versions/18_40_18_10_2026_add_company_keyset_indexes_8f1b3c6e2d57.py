@@ -0,0 +1,33 @@
+"""add company keyset indexes
+
+Revision ID: 8f1b3c6e2d57
+Revises: 5e9c2d7b3a14
+Create Date: 2026-10-18 18:40:12.583114
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '8f1b3c6e2d57'
+down_revision: Union[str, Sequence[str], None] = '5e9c2d7b3a14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_department_company_id', 'department', ['company_id', 'id'], unique=False)
+    op.create_index('ix_usercompanymembership_company_id', 'usercompanymembership', ['company_id', 'id'], unique=False)
+    op.create_index(
+        'ix_usercompanymembership_department_id', 'usercompanymembership', ['department_id', 'id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_usercompanymembership_department_id', table_name='usercompanymembership')
+    op.drop_index('ix_usercompanymembership_company_id', table_name='usercompanymembership')
+    op.drop_index('ix_department_company_id', table_name='department')
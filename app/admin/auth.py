@@ -1,4 +1,4 @@
-from fastapi_users.password import PasswordHelper
+from fastapi import HTTPException
 from sqlalchemy import select
 from starlette.requests import Request
 from starlette.responses import Response
@@ -6,13 +6,12 @@ from starlette_admin.auth import AdminConfig, AdminUser, AuthProvider, FormValid
 
 from app.core.config import settings
 from app.core.db import AsyncSessionLocal
+from app.core.password import password_hasher
 from app.models.user import User
 
 ADMIN_TITLE = f'{settings.app_title} Admin'
 FAIL_MESSAGE = 'Not allowed'
 
-password_helper = PasswordHelper()
-
 
 class SuperuserAuth(AuthProvider):
     async def login(
@@ -24,7 +23,10 @@ class SuperuserAuth(AuthProvider):
             user = await session.scalar(select(User).where(User.email == username))
             if not user or not user.hashed_password:
                 raise LoginFailed(FAIL_MESSAGE)
-            ok, new_hash = password_helper.verify_and_update(password, user.hashed_password)
+            try:
+                ok, new_hash = await password_hasher.verify_and_update(password, user.hashed_password)
+            except HTTPException as error:
+                raise LoginFailed(error.detail)
             if not (ok and user.is_superuser):
                 raise LoginFailed(FAIL_MESSAGE)
             if new_hash:
@@ -11,7 +11,7 @@ from app.admin.views.motivation import RatingView
 from app.admin.views.task import TaskCommentView, TaskView
 from app.admin.views.user import UserView
 from app.core.config import settings
-from app.core.db import engine
+from app.core.db import ReadSessionLocal, engine
 
 views = (
     UserView,
@@ -31,6 +31,7 @@ views = (
 def init_admin(app: FastAPI) -> Admin:
     admin = Admin(
         engine,
+        session_maker=ReadSessionLocal,
         title=ADMIN_TITLE,
         auth_provider=SuperuserAuth(),
         middlewares=[Middleware(SessionMiddleware, secret_key=settings.secret)],
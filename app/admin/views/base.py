@@ -1,7 +1,21 @@
 from starlette_admin import ExportType
 from starlette_admin.contrib.sqla.ext.pydantic import ModelView
 
+from app.core.db import use_primary
+
 
 class BaseModelView(ModelView):
     export_types = [ExportType.EXCEL, ExportType.PDF]
     page_size_options = [5, 10, 25, 50, -1]
+
+    async def create(self, request, data):
+        use_primary(request.state.session)
+        return await super().create(request, data)
+
+    async def edit(self, request, pk, data):
+        use_primary(request.state.session)
+        return await super().edit(request, pk, data)
+
+    async def delete(self, request, pks):
+        use_primary(request.state.session)
+        return await super().delete(request, pks)
@@ -2,6 +2,7 @@ from sqlalchemy import func, select
 from starlette_admin.exceptions import FormValidationError
 
 from app.admin.views.base import BaseModelView
+from app.crud.company import department_crud
 from app.models.company import Company, CompanyNews, Department, Invite, UserCompanyMembership
 from app.schemas.company import (
     CompanyCreate,
@@ -83,6 +84,15 @@ class DepartmentView(BaseModelView):
                 query = query.where(Department.id != int(departament_id))
             if await session.scalar(query):
                 errors['name'] = 'В этой компании такой отдел уже есть'
+            parent = data.get('parent')
+            if parent and parent.company_id != company.id:
+                errors['parent'] = 'Родительский отдел должен быть в той же компании'
+            elif (
+                parent
+                and departament_id
+                and await department_crud.is_in_subtree(parent.id, int(departament_id), session)
+            ):
+                errors['parent'] = 'Нельзя подчинить отдел самому себе или своему подотделу'
         if errors:
             raise FormValidationError(errors)
         return data
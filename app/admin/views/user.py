@@ -1,8 +1,10 @@
-from fastapi_users.password import PasswordHelper
+from fastapi import HTTPException
 from sqlalchemy import select
 from starlette_admin.exceptions import FormValidationError
 
 from app.admin.views.base import BaseModelView
+from app.core.password import password_hasher
+from app.core.user import revoke_tokens
 from app.models.user import User
 from app.schemas.user import UserCreate
 
@@ -37,7 +39,17 @@ class UserView(BaseModelView):
             if await session.scalar(query):
                 errors['email'] = 'Пользователь с таким email уже существует'
         if not errors:
-            data['hashed_password'] = PasswordHelper().hash(data.get('hashed_password'))
+            try:
+                data['hashed_password'] = await password_hasher.hash(data.get('hashed_password'))
+            except HTTPException as error:
+                errors['hashed_password'] = error.detail
         if errors:
             raise FormValidationError(errors)
         return data
+
+    async def before_edit(self, request, data, obj):
+        obj.token_version = User.token_version + 1
+        await revoke_tokens(obj, request.state.session)
+
+    async def before_delete(self, request, obj):
+        await revoke_tokens(obj, request.state.session)
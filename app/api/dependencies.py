@@ -3,7 +3,7 @@ from http import HTTPStatus
 from fastapi import Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.db import get_async_session
+from app.core.db import get_async_session, use_replica
 from app.core.user import current_user
 from app.crud.company import membership_crud
 from app.models.company import UserRole
@@ -14,6 +14,10 @@ NOT_COMPANY_MEMBER = 'Вы не являетесь работником этой
 NOT_MANAGER_OR_ADMIN = 'Требуются права менеджера, администратора или суперпользователя!'
 
 
+async def read_from_replica(session: AsyncSession = Depends(get_async_session)) -> None:
+    use_replica(session)
+
+
 async def user_admin_or_superuser(
     company_id: int, user: User = Depends(current_user), session: AsyncSession = Depends(get_async_session)
 ) -> User:
@@ -1,17 +1,46 @@
-from fastapi import APIRouter, Depends
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.validators import check_user_in_company
+from app.api.dependencies import read_from_replica
+from app.api.routing import SessionRoute
+from app.api.validators import check_calendar_range, check_cursor, check_user_in_company
+from app.core.constants import DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT
 from app.core.db import get_async_session
 from app.core.user import current_user
+from app.crud.base import encode_cursor
 from app.crud.calendar import CalendarService
 from app.models.user import User
-from app.schemas.calendar import CalendarRead, CalendarScope
+from app.schemas.calendar import CalendarPage, CalendarRead, CalendarScope
+
+router = APIRouter(route_class=SessionRoute, tags=['Календарь'])
+
 
-router = APIRouter(tags=['Календарь'])
+@router.get('/{company_id}/calendar', response_model=CalendarPage, dependencies=[Depends(read_from_replica)])
+async def get_events_in_range(
+    company_id: int,
+    date_from: datetime = Query(alias='from'),
+    date_to: datetime = Query(alias='to'),
+    cursor: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    session: AsyncSession = Depends(get_async_session),
+    user: User = Depends(current_user),
+):
+    check_calendar_range(date_from, date_to)
+    after = check_cursor(cursor, datetime, str, int) if cursor is not None else None
+    await check_user_in_company(user.id, company_id, session)
+    events = CalendarService(company_id, user.id, date_from, date_to, session)
+    page, last = await events.fetch_page(limit, after)
+    return CalendarPage(
+        date_from=date_from,
+        date_to=date_to,
+        next_cursor=encode_cursor(*last) if last is not None else None,
+        **page,
+    )
 
 
-@router.get('/{company_id}/calendar/{scope}', response_model=CalendarRead)
+@router.get('/{company_id}/calendar/{scope}', response_model=CalendarRead, dependencies=[Depends(read_from_replica)])
 async def get_events(
     company_id: int,
     scope: CalendarScope,
@@ -19,10 +48,5 @@ async def get_events(
     user: User = Depends(current_user),
 ):
     await check_user_in_company(user.id, company_id, session)
-    events = CalendarService(company_id, user.id, scope, session)
-    return CalendarRead(
-        scope=scope,
-        news=await events.fetch_news(),
-        tasks=await events.fetch_tasks(),
-        meetings=await events.fetch_meetings(),
-    )
+    events = CalendarService.for_scope(company_id, user.id, scope, session)
+    return CalendarRead(scope=scope, **await events.fetch_events())
@@ -1,23 +1,36 @@
 from enum import StrEnum
 from http import HTTPStatus
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.dependencies import user_admin_or_superuser, user_member_or_superuser
+from app.api.dependencies import read_from_replica, user_admin_or_superuser, user_member_or_superuser
+from app.api.routing import SessionRoute
 from app.api.validators import (
     check_before_delete_membership,
     check_before_invite,
     check_before_leave,
     check_before_update_membership,
+    check_cursor,
+    check_department_parent,
     check_invite_exists,
+    check_invites_can_be_created,
     get_in_company_or_404,
     get_or_404,
 )
+from app.core.constants import MAX_PAGE_LIMIT, NEXT_CURSOR_HEADER
 from app.core.db import get_async_session
 from app.core.user import current_user
-from app.crud.company import company_crud, department_crud, invites_crud, membership_crud, news_crud
+from app.crud.company import (
+    company_crud,
+    department_crud,
+    invite_import_crud,
+    membership_crud,
+    news_crud,
+)
+from app.crud.mail import mail_outbox_crud
 from app.models.company import UserRole
 from app.models.user import User
 from app.schemas.company import (
@@ -31,18 +44,20 @@ from app.schemas.company import (
     CompanyRead,
     CompanyUpdate,
     DepartmentCreate,
+    DepartmentNode,
     DepartmentRead,
     DepartmentUpdate,
     InviteCreate,
+    InviteImportRead,
     InviteRead,
 )
-from app.services.invite import generate_invite_code, send_invite_email
+from app.services.invite import build_invite_email, create_invites, parse_invite_file
 
 COMPANY_NAME_EXISTS = 'Компания с именем "{}" уже существует!'
 DEPARTMENT_NAME_EXISTS = 'В компании id={} уже существует отдел "{}"!'
 MEMBERSHIP_EXISTS = 'Пользователь id={} уже состоит в компании id={}!'
 
-router = APIRouter(prefix='/companies')
+router = APIRouter(route_class=SessionRoute, prefix='/companies')
 
 
 class CompanyTags(StrEnum):
@@ -69,7 +84,6 @@ async def create_new_company(
         commit=False,
     )
     await session.commit()
-    await session.refresh(membership)
     return membership
 
 
@@ -109,12 +123,22 @@ async def remove_company(company_id: int, session: AsyncSession = Depends(get_as
     '/{company_id}/news',
     response_model=list[CompanyNewsRead],
     response_model_exclude_none=True,
-    dependencies=[Depends(user_member_or_superuser)],
+    dependencies=[Depends(read_from_replica), Depends(user_member_or_superuser)],
     tags=[CompanyTags.NEWS],
 )
-async def get_all_news(company_id: int, session: AsyncSession = Depends(get_async_session)):
+async def get_all_news(
+    company_id: int,
+    response: Response,
+    cursor: str | None = None,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_LIMIT),
+    session: AsyncSession = Depends(get_async_session),
+):
     await get_or_404(company_crud, company_id, session)
-    return await news_crud.get_multi_by_company(company_id, session)
+    after = check_cursor(cursor, *news_crud.cursor_types) if cursor is not None else None
+    news, next_cursor = await news_crud.get_multi_by_company(company_id, session, limit, after)
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return news
 
 
 @router.post(
@@ -163,9 +187,55 @@ async def remove_news(news_id: int, company_id: int, session: AsyncSession = Dep
     dependencies=[Depends(user_member_or_superuser)],
     tags=[CompanyTags.DEPARTMENTS],
 )
-async def get_all_departments(company_id: int, session: AsyncSession = Depends(get_async_session)):
+async def get_all_departments(
+    company_id: int,
+    response: Response,
+    cursor: str | None = None,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_LIMIT),
+    session: AsyncSession = Depends(get_async_session),
+):
+    await get_or_404(company_crud, company_id, session)
+    after = check_cursor(cursor, *department_crud.cursor_types) if cursor is not None else None
+    departments, next_cursor = await department_crud.get_multi_by_company(company_id, session, limit, after)
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return departments
+
+
+@router.get(
+    '/{company_id}/departments/tree',
+    response_model=list[DepartmentNode],
+    dependencies=[Depends(user_member_or_superuser)],
+    tags=[CompanyTags.DEPARTMENTS],
+)
+async def get_departments_tree(company_id: int, session: AsyncSession = Depends(get_async_session)):
     await get_or_404(company_crud, company_id, session)
-    return await department_crud.get_multi_by_company(company_id, session)
+    return await department_crud.get_org_chart(company_id, session)
+
+
+@router.get(
+    '/{company_id}/departments/{department_id}/members',
+    response_model=list[CompanyMembershipRead],
+    response_model_exclude_none=True,
+    dependencies=[Depends(user_member_or_superuser)],
+    tags=[CompanyTags.DEPARTMENTS],
+)
+async def get_department_subtree_members(
+    company_id: int,
+    department_id: int,
+    response: Response,
+    cursor: str | None = None,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_LIMIT),
+    session: AsyncSession = Depends(get_async_session),
+):
+    await get_in_company_or_404(department_crud, department_id, company_id, session)
+    after = check_cursor(cursor, *membership_crud.cursor_types) if cursor is not None else None
+    memberships, next_cursor = await membership_crud.get_multi_by_department_subtree(
+        department_id, session, limit, after
+    )
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return memberships
 
 
 @router.post(
@@ -179,6 +249,7 @@ async def create_department(
     company_id: int, obj_in: DepartmentCreate, session: AsyncSession = Depends(get_async_session)
 ):
     await get_or_404(company_crud, company_id, session)
+    await check_department_parent(obj_in.parent_id, company_id, session)
     try:
         department = await department_crud.create(obj_in, company_id, session)
     except IntegrityError:
@@ -202,10 +273,10 @@ async def update_department(
     obj_in: DepartmentUpdate,
     session: AsyncSession = Depends(get_async_session),
 ):
+    department = await get_in_company_or_404(department_crud, department_id, company_id, session)
+    await check_department_parent(obj_in.parent_id, company_id, session, department_id)
     try:
-        department = await department_crud.update(
-            await get_in_company_or_404(department_crud, department_id, company_id, session), obj_in, session
-        )
+        department = await department_crud.update(department, obj_in, session)
     except IntegrityError:
         await session.rollback()
         raise HTTPException(
@@ -236,16 +307,45 @@ async def delete_department(company_id: int, department_id: int, session: AsyncS
 async def send_invite(
     obj_in: InviteCreate,
     company_id: int,
-    background: BackgroundTasks,
     session: AsyncSession = Depends(get_async_session),
 ):
     await check_before_invite(obj_in, company_id, session)
-    code = await generate_invite_code(session)
-    invite = await invites_crud.create(obj_in, company_id, code, session)
-    background.add_task(send_invite_email, obj_in.email, code)
+    (invite,) = await create_invites([obj_in], company_id, session)
+    await mail_outbox_crud.create(build_invite_email(invite.email, invite.code), session, commit=False)
+    await session.commit()
     return invite
 
 
+@router.post(
+    '/{company_id}/invites:import',
+    response_model=InviteImportRead,
+    status_code=HTTPStatus.ACCEPTED,
+    tags=[CompanyTags.INVITES],
+)
+async def import_invites(
+    company_id: int,
+    file: UploadFile,
+    session: AsyncSession = Depends(get_async_session),
+    user: User = Depends(user_admin_or_superuser),
+):
+    await get_or_404(company_crud, company_id, session)
+    items, errors = await run_in_threadpool(parse_invite_file, file.file, file.filename)
+    accepted, rejected = await check_invites_can_be_created(company_id, items, session)
+    return await invite_import_crud.create_for_company(
+        company_id, user, {row: items[row] for row in accepted}, errors | rejected, session
+    )
+
+
+@router.get(
+    '/{company_id}/invites/imports/{import_id}',
+    response_model=InviteImportRead,
+    dependencies=[Depends(user_admin_or_superuser)],
+    tags=[CompanyTags.INVITES],
+)
+async def get_invite_import(import_id: int, company_id: int, session: AsyncSession = Depends(get_async_session)):
+    return await get_in_company_or_404(invite_import_crud, import_id, company_id, session)
+
+
 @router.post(
     '/invites/accept',
     response_model=CompanyMembershipRead,
@@ -271,7 +371,6 @@ async def accept_invite(
         )
         await session.delete(invite)
         await session.commit()
-        await session.refresh(membership)
     except IntegrityError:
         await session.rollback()
         raise HTTPException(
@@ -287,9 +386,19 @@ async def accept_invite(
     dependencies=[Depends(user_member_or_superuser)],
     tags=[CompanyTags.MEMBERS],
 )
-async def get_all_memberships(company_id: int, session: AsyncSession = Depends(get_async_session)):
+async def get_all_memberships(
+    company_id: int,
+    response: Response,
+    cursor: str | None = None,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_LIMIT),
+    session: AsyncSession = Depends(get_async_session),
+):
     await get_or_404(company_crud, company_id, session)
-    return await membership_crud.get_multi_by_company(company_id, session)
+    after = check_cursor(cursor, *membership_crud.cursor_types) if cursor is not None else None
+    memberships, next_cursor = await membership_crud.get_multi_by_company(company_id, session, limit, after)
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return memberships
 
 
 @router.patch(
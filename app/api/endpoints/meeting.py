@@ -1,28 +1,42 @@
 from http import HTTPStatus
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from fastapi.encoders import jsonable_encoder
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dependencies import user_manager_admin_or_superuser, user_member_or_superuser
+from app.api.routing import SessionRoute
 from app.api.validators import (
+    USER_IN_MEETINGS_EXISTS,
     check_can_manage_obj,
+    check_cursor,
     check_user_in_company,
     check_user_is_not_busy,
+    check_users_can_attend,
+    check_users_in_company,
     get_in_company_or_404,
 )
+from app.core.constants import MAX_PAGE_LIMIT, NEXT_CURSOR_HEADER
 from app.core.db import get_async_session
 from app.core.user import current_user
 from app.crud.meeting import attendee_crud, meeting_crud
 from app.models.user import User
-from app.schemas.meeting import MeetingAttendeeRead, MeetingCreate, MeetingRead, MeetingUpdate
+from app.schemas.meeting import (
+    FreeSlot,
+    FreeSlotsSearch,
+    MeetingAttendeeRead,
+    MeetingCreate,
+    MeetingInvite,
+    MeetingInviteRejected,
+    MeetingInviteResult,
+    MeetingRead,
+    MeetingUpdate,
+)
 from app.schemas.user import UserShortRead
+from app.services.schedule import find_free_slots
 
-router = APIRouter(tags=['Встречи'])
-
-
-USER_IN_MEETINGS_EXISTS = 'Пользователь с id={} уже участвует в встрече id={}'
+router = APIRouter(route_class=SessionRoute, tags=['Встречи'])
 
 
 @router.post('/{company_id}/meetings', response_model=MeetingRead)
@@ -38,8 +52,30 @@ async def create_meeting(
 @router.get(
     '/{company_id}/meetings', response_model=list[MeetingRead], dependencies=[Depends(user_member_or_superuser)]
 )
-async def get_all_meetings(company_id: int, session: AsyncSession = Depends(get_async_session)):
-    return await meeting_crud.get_multi_by_company(company_id, session)
+async def get_all_meetings(
+    company_id: int,
+    response: Response,
+    cursor: str | None = None,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_LIMIT),
+    session: AsyncSession = Depends(get_async_session),
+):
+    after = check_cursor(cursor, *meeting_crud.cursor_types) if cursor is not None else None
+    meetings, next_cursor = await meeting_crud.get_multi_by_company(company_id, session, limit, after)
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return meetings
+
+
+@router.post(
+    '/{company_id}/meetings/free-slots',
+    response_model=list[FreeSlot],
+    dependencies=[Depends(user_member_or_superuser)],
+)
+async def get_free_slots(company_id: int, obj_in: FreeSlotsSearch, session: AsyncSession = Depends(get_async_session)):
+    await check_users_in_company(obj_in.user_ids, company_id, session)
+    busy = await meeting_crud.get_busy_periods(obj_in.user_ids, obj_in.start_at, obj_in.end_at, session)
+    slots = find_free_slots(busy, obj_in.start_at, obj_in.end_at, obj_in.duration, obj_in.limit)
+    return [FreeSlot(start_at=start_at, end_at=end_at) for start_at, end_at in slots]
 
 
 @router.patch('/{company_id}/meetings/{meeting_id}', response_model=MeetingRead)
@@ -89,3 +125,24 @@ async def invite_meeting(
     invited_users = await attendee_crud.get_users_from_meeting_attend(meeting_id, session)
     invited = [UserShortRead(id=user.id, email=user.email) for user in invited_users]
     return MeetingAttendeeRead(**jsonable_encoder(meeting), invited=invited)
+
+
+@router.post('/{company_id}/meetings/{meeting_id}/invite', response_model=MeetingInviteResult)
+async def invite_many_meeting(
+    company_id: int,
+    meeting_id: int,
+    obj_in: MeetingInvite,
+    session: AsyncSession = Depends(get_async_session),
+    user: User = Depends(current_user),
+):
+    meeting = await get_in_company_or_404(meeting_crud, meeting_id, company_id, session)
+    await check_can_manage_obj(user, company_id, meeting, session)
+    accepted, rejected = await check_users_can_attend(meeting, obj_in.user_ids, session)
+    added = await attendee_crud.create_multi(meeting_id, accepted, session) if accepted else []
+    for user_id in set(accepted) - set(added):
+        rejected[user_id] = USER_IN_MEETINGS_EXISTS.format(user_id, meeting_id)
+    return MeetingInviteResult(
+        meeting_id=meeting_id,
+        added=added,
+        rejected=[MeetingInviteRejected(user_id=user_id, reason=reason) for user_id, reason in rejected.items()],
+    )
@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.dependencies import read_from_replica
+from app.api.routing import SessionRoute
+from app.core.constants import DEFAULT_JOB_RUNS_LIMIT, MAX_PAGE_LIMIT
+from app.core.db import get_async_session, get_pool_metrics
+from app.core.user import current_superuser
+from app.crud.job import job_run_crud
+from app.schemas.job import JobRunRead
+from app.schemas.metrics import PoolMetricsRead
+
+router = APIRouter(route_class=SessionRoute, prefix='/metrics', tags=['Метрики'])
+
+
+@router.get('/db-pool', response_model=dict[str, PoolMetricsRead], dependencies=[Depends(current_superuser)])
+async def get_db_pool_metrics():
+    return get_pool_metrics()
+
+
+@router.get(
+    '/jobs', response_model=list[JobRunRead], dependencies=[Depends(read_from_replica), Depends(current_superuser)]
+)
+async def get_job_runs(
+    job_id: str | None = None,
+    limit: int = Query(DEFAULT_JOB_RUNS_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    session: AsyncSession = Depends(get_async_session),
+):
+    return await job_run_crud.get_recent(job_id, limit, session)
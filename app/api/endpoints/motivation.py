@@ -4,17 +4,27 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.validators import check_can_evaluate_task, check_user_in_company
+from app.api.dependencies import read_from_replica, user_admin_or_superuser, user_member_or_superuser
+from app.api.routing import SessionRoute
+from app.api.validators import check_can_evaluate_task, check_user_in_company, get_in_company_or_404
+from app.core.constants import DEFAULT_LEADERBOARD_SIZE, MAX_LEADERBOARD_SIZE
 from app.core.db import get_async_session
 from app.core.user import current_user
-from app.crud.motivation import rating_crud
+from app.crud.company import department_crud
+from app.crud.motivation import rating_crud, rating_rollup_crud
 from app.models.user import User
-from app.schemas.motivation import RatingCreate, RatingRead, RatingsSummary
+from app.schemas.motivation import (
+    DepartmentRatingsSummary,
+    RatingCreate,
+    RatingRead,
+    RatingsLeaderboard,
+    RatingsSummary,
+)
 
 EVALUATE_EXISTS = 'Задача с id={} уже оценена!'
 
 
-router = APIRouter(tags=['Мотивация'])
+router = APIRouter(route_class=SessionRoute, tags=['Мотивация'])
 
 
 @router.post('/{company_id}/tasks/{task_id}/evaluate', response_model=RatingRead)
@@ -34,7 +44,7 @@ async def evaluate_task(
         raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail=EVALUATE_EXISTS.format(task_id))
 
 
-@router.get('/{company_id}/ratings', response_model=RatingsSummary)
+@router.get('/{company_id}/ratings', response_model=RatingsSummary, dependencies=[Depends(read_from_replica)])
 async def get_user_and_department_ratings(
     company_id: int,
     year: int = Query(ge=1000, le=9999),
@@ -45,3 +55,39 @@ async def get_user_and_department_ratings(
     membership = await check_user_in_company(user.id, company_id, session)
     ratings, user_avg, department_avg = await rating_crud.summary(membership, session, year, quarter)
     return RatingsSummary(items=ratings, user_avg=user_avg, department_avg=department_avg)
+
+
+@router.get(
+    '/{company_id}/ratings/leaderboard',
+    response_model=RatingsLeaderboard,
+    dependencies=[Depends(user_admin_or_superuser)],
+)
+async def get_ratings_leaderboard(
+    company_id: int,
+    year: int = Query(ge=1000, le=9999),
+    quarter: int = Query(ge=1, le=4),
+    limit: int = Query(DEFAULT_LEADERBOARD_SIZE, ge=1, le=MAX_LEADERBOARD_SIZE),
+    session: AsyncSession = Depends(get_async_session),
+):
+    return RatingsLeaderboard(
+        year=year,
+        quarter=quarter,
+        histogram=await rating_crud.histogram(company_id, year, quarter, session),
+        **await rating_rollup_crud.leaderboard(company_id, year, quarter, limit, session),
+    )
+
+
+@router.get(
+    '/{company_id}/departments/{department_id}/ratings',
+    response_model=DepartmentRatingsSummary,
+    dependencies=[Depends(user_member_or_superuser)],
+)
+async def get_department_subtree_ratings(
+    company_id: int,
+    department_id: int,
+    year: int = Query(ge=1000, le=9999),
+    quarter: int = Query(ge=1, le=4),
+    session: AsyncSession = Depends(get_async_session),
+):
+    await get_in_company_or_404(department_crud, department_id, company_id, session)
+    return await rating_rollup_crud.subtree_summary(department_id, session, year, quarter)
@@ -1,24 +1,40 @@
 from enum import StrEnum
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.dependencies import user_manager_admin_or_superuser, user_member_or_superuser
+from app.api.dependencies import read_from_replica, user_manager_admin_or_superuser, user_member_or_superuser
+from app.api.routing import SessionRoute
 from app.api.validators import (
     check_can_delete_task,
     check_can_manage_obj,
     check_can_update_task,
     check_comment_in_task_and_company,
+    check_cursor,
     check_manager_can_create_task,
+    check_tasks_can_be_created,
+    check_tasks_can_be_updated,
     check_user_in_company,
     get_in_company_or_404,
 )
+from app.core.constants import MAX_PAGE_LIMIT, NEXT_CURSOR_HEADER
 from app.core.db import get_async_session
 from app.crud.task import task_comment_crud, task_crud
 from app.models.user import User
-from app.schemas.task import TaskCommentCreate, TaskCommentRead, TaskCommentUpdate, TaskCreate, TaskRead, TaskUpdate
+from app.schemas.task import (
+    TaskBatchCreate,
+    TaskBatchError,
+    TaskBatchResult,
+    TaskBatchUpdate,
+    TaskCommentCreate,
+    TaskCommentRead,
+    TaskCommentUpdate,
+    TaskCreate,
+    TaskRead,
+    TaskUpdate,
+)
 
-router = APIRouter()
+router = APIRouter(route_class=SessionRoute)
 
 
 class TaskTags(StrEnum):
@@ -39,14 +55,56 @@ async def create_task(
     return await task_crud.create_for_company(obj_in, company_id, session, author=user)
 
 
+@router.post('/{company_id}/tasks:batch', response_model=TaskBatchResult, tags=[TaskTags.TASKS])
+async def create_tasks_batch(
+    company_id: int,
+    obj_in: TaskBatchCreate,
+    session: AsyncSession = Depends(get_async_session),
+    user: User = Depends(user_manager_admin_or_superuser),
+):
+    accepted, rejected = await check_tasks_can_be_created(user, company_id, obj_in.items, session)
+    tasks = (
+        await task_crud.create_multi([obj_in.items[index] for index in accepted], company_id, session, author=user)
+        if accepted
+        else []
+    )
+    return TaskBatchResult(
+        items=tasks, errors=[TaskBatchError(index=index, reason=reason) for index, reason in rejected.items()]
+    )
+
+
+@router.patch('/{company_id}/tasks:batch', response_model=TaskBatchResult, tags=[TaskTags.TASKS])
+async def update_tasks_batch(
+    company_id: int,
+    obj_in: TaskBatchUpdate,
+    session: AsyncSession = Depends(get_async_session),
+    user: User = Depends(user_member_or_superuser),
+):
+    accepted, rejected = await check_tasks_can_be_updated(user, company_id, obj_in.items, session)
+    tasks = await task_crud.update_multi([obj_in.items[index] for index in accepted], session) if accepted else []
+    return TaskBatchResult(
+        items=tasks, errors=[TaskBatchError(index=index, reason=reason) for index, reason in rejected.items()]
+    )
+
+
 @router.get(
     '/{company_id}/tasks',
     response_model=list[TaskRead],
-    dependencies=[Depends(user_member_or_superuser)],
+    dependencies=[Depends(read_from_replica), Depends(user_member_or_superuser)],
     tags=[TaskTags.TASKS],
 )
-async def get_all_tasks(company_id: int, session: AsyncSession = Depends(get_async_session)):
-    return await task_crud.get_multi_by_company(company_id, session)
+async def get_all_tasks(
+    company_id: int,
+    response: Response,
+    cursor: str | None = None,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_LIMIT),
+    session: AsyncSession = Depends(get_async_session),
+):
+    after = check_cursor(cursor, *task_crud.cursor_types) if cursor is not None else None
+    tasks, next_cursor = await task_crud.get_multi_by_company(company_id, session, limit, after)
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return tasks
 
 
 @router.patch('/{company_id}/tasks/{task_id}', response_model=TaskRead, tags=[TaskTags.TASKS])
@@ -92,9 +150,20 @@ async def create_task_comment(
     dependencies=[Depends(user_member_or_superuser)],
     tags=[TaskTags.COMMENTS],
 )
-async def get_all_task_comments(company_id: int, task_id: int, session: AsyncSession = Depends(get_async_session)):
+async def get_all_task_comments(
+    company_id: int,
+    task_id: int,
+    response: Response,
+    cursor: str | None = None,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_LIMIT),
+    session: AsyncSession = Depends(get_async_session),
+):
     await get_in_company_or_404(task_crud, task_id, company_id, session)
-    return await task_comment_crud.get_multi_by_task(task_id, session)
+    after = check_cursor(cursor, *task_comment_crud.cursor_types) if cursor is not None else None
+    comments, next_cursor = await task_comment_crud.get_multi_by_task(task_id, session, limit, after)
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return comments
 
 
 @router.patch(
@@ -3,6 +3,7 @@ from fastapi import APIRouter
 from app.api.endpoints.calendar import router as calendar_router
 from app.api.endpoints.company import router as company_router
 from app.api.endpoints.meeting import router as meeting_router
+from app.api.endpoints.metrics import router as metrics_router
 from app.api.endpoints.motivation import router as motivation_router
 from app.api.endpoints.task import router as task_router
 from app.api.endpoints.user import router as user_router
@@ -15,6 +16,7 @@ company_router.include_router(calendar_router)
 router_v1 = APIRouter(prefix='/v1')
 router_v1.include_router(user_router)
 router_v1.include_router(company_router)
+router_v1.include_router(metrics_router)
 
 main_router = APIRouter(prefix='/api')
 main_router.include_router(router_v1)
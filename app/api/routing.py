@@ -0,0 +1,37 @@
+from functools import wraps
+
+from fastapi.routing import APIRoute
+
+from app.core.db import release_sessions, request_sessions
+
+
+def release_sessions_on_return(endpoint):
+    if getattr(endpoint, 'releases_sessions', False):
+        return endpoint
+
+    @wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await endpoint(*args, **kwargs)
+        finally:
+            await release_sessions()
+
+    wrapper.releases_sessions = True
+    return wrapper
+
+
+class SessionRoute(APIRoute):
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, release_sessions_on_return(endpoint), **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def route_handler(request):
+            token = request_sessions.set([])
+            try:
+                return await handler(request)
+            finally:
+                request_sessions.reset(token)
+
+        return route_handler
@@ -4,15 +4,17 @@ from http import HTTPStatus
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.crud.base import CRUDBase
+from app.core.config import settings
+from app.crud.base import CRUDBase, decode_cursor
 from app.crud.company import company_crud, department_crud, invites_crud, membership_crud
-from app.crud.meeting import meeting_crud
+from app.crud.meeting import attendee_crud, meeting_crud
 from app.crud.task import task_comment_crud, task_crud
-from app.models.company import Invite, UserCompanyMembership, UserRole
+from app.models.company import Department, Invite, UserCompanyMembership, UserRole
+from app.models.meeting import Meeting
 from app.models.task import Task, TaskComment, TaskStatus
 from app.models.user import User
 from app.schemas.company import CompanyMembershipUpdate, InviteCreate
-from app.schemas.task import TaskUpdate
+from app.schemas.task import TaskBatchUpdateItem, TaskCreate, TaskUpdate
 
 NOT_FOUND = '{} c id={} не найден!'
 NOT_FOUND_IN_COMPANY = '{} id={} не найден(а) в компании id={}!'
@@ -22,6 +24,7 @@ INVITE_EMAIL_MISMATCH = 'Инвайт не предназначен для {}!'
 MANAGER_ROLE_REQUIRED = 'Пользователь id={} не менеджер и не админ!'
 LAST_ADMIN_FORBIDDEN = 'Нельзя удалить единственного администратора!'
 SELF_MANAGER_FORBIDDEN = 'Нельзя назначить менеджером самого себя!'
+SUBORDINATE_MANAGER_FORBIDDEN = 'Пользователь id={} находится в цепочке подчинённых и не может стать менеджером!'
 ONLY_SUBORDINATES = 'Можно назначать задачи только подчинённым!'
 EXECUTOR_ONLY_STATUS = 'Исполнитель может менять только статус!'
 CANNOT_EDIT_TASK = 'У пользователя id={} нет прав на редактирование задачи {}!'
@@ -31,6 +34,12 @@ COMMENT_NOT_FOUND = 'Комментарий id={} не найден в зада
 NOT_TASK_AUTHOR = 'Пользователь id={} не ставил задачу id={}!'
 TASK_NOT_DONE = 'Нельзя оценить задачу id={}, пока она не завершена!'
 USER_IS_BUSY = 'Пользователь занят: {}'
+USER_IN_MEETINGS_EXISTS = 'Пользователь с id={} уже участвует в встрече id={}'
+INVALID_CURSOR = 'Некорректный курсор пагинации: {}'
+INVALID_PERIOD = 'Конец периода должен быть позже его начала!'
+DUPLICATE_BATCH_ITEM = 'Задача id={} указана в пакете несколько раз!'
+DUPLICATE_INVITE_EMAIL = 'Адрес {} указан в файле несколько раз!'
+DEPARTMENT_CYCLE = 'Отдел id={} нельзя подчинить отделу id={} из его же поддерева!'
 
 
 async def get_or_404(crud: CRUDBase, obj_id: int, session: AsyncSession):
@@ -89,6 +98,45 @@ async def check_before_invite(obj_in: InviteCreate, company_id: int, session: As
         await check_manager_in_company(obj_in.manager_id, company_id, session)
 
 
+async def check_invites_can_be_created(
+    company_id: int, items: dict[int, InviteCreate], session: AsyncSession
+) -> tuple[list[int], dict[int, str]]:
+    department_ids = list({item.department_id for item in items.values() if item.department_id})
+    manager_ids = list({item.manager_id for item in items.values() if item.manager_id})
+    departments = (
+        await department_crud.get_ids_in_company(department_ids, company_id, session) if department_ids else set()
+    )
+    managers = (
+        await membership_crud.get_multi_by_users_and_company(manager_ids, company_id, session) if manager_ids else {}
+    )
+    accepted, rejected, seen = [], {}, set()
+    for row, item in items.items():
+        if item.email in seen:
+            rejected[row] = DUPLICATE_INVITE_EMAIL.format(item.email)
+        elif item.department_id and item.department_id not in departments:
+            rejected[row] = NOT_FOUND_IN_COMPANY.format(Department.__name__, item.department_id, company_id)
+        elif item.manager_id and item.manager_id not in managers:
+            rejected[row] = NOT_FOUND_USER_IN_COMPANY.format(item.manager_id, company_id)
+        elif item.manager_id and managers[item.manager_id].role not in {UserRole.MANAGER, UserRole.ADMIN}:
+            rejected[row] = MANAGER_ROLE_REQUIRED.format(item.manager_id)
+        else:
+            accepted.append(row)
+        seen.add(item.email)
+    return accepted, rejected
+
+
+async def check_department_parent(
+    parent_id: int | None, company_id: int, session: AsyncSession, department_id: int | None = None
+):
+    if parent_id is None:
+        return
+    await get_in_company_or_404(department_crud, parent_id, company_id, session)
+    if department_id is not None and await department_crud.is_in_subtree(parent_id, department_id, session):
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST, detail=DEPARTMENT_CYCLE.format(department_id, parent_id)
+        )
+
+
 async def check_before_update_membership(
     obj_in: CompanyMembershipUpdate, company_id: int, membership: UserCompanyMembership, session: AsyncSession
 ):
@@ -98,6 +146,10 @@ async def check_before_update_membership(
         if obj_in.manager_id == membership.user_id:
             raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail=SELF_MANAGER_FORBIDDEN)
         await check_manager_in_company(obj_in.manager_id, company_id, session)
+        if await membership_crud.is_subordinate(obj_in.manager_id, membership.user_id, company_id, session):
+            raise HTTPException(
+                status_code=HTTPStatus.BAD_REQUEST, detail=SUBORDINATE_MANAGER_FORBIDDEN.format(obj_in.manager_id)
+            )
     if obj_in.role and obj_in.role != UserRole.ADMIN and membership.role == UserRole.ADMIN:
         await check_last_admin(membership, company_id, session)
 
@@ -127,12 +179,62 @@ async def check_manager_can_create_task(
     manager_id: int, company_id: int, executor_membership: UserCompanyMembership, session: AsyncSession
 ):
     manager_membership = await check_manager_in_company(manager_id, company_id, session)
-    if manager_membership.role == UserRole.ADMIN:
+    if manager_membership.role == UserRole.ADMIN or executor_membership.manager_id == manager_id:
         return
-    if manager_membership.role == UserRole.MANAGER and executor_membership.manager_id != manager_id:
+    if not settings.manager_chain_assignment or not await membership_crud.is_subordinate(
+        executor_membership.user_id, manager_id, company_id, session
+    ):
         raise HTTPException(status_code=HTTPStatus.FORBIDDEN, detail=ONLY_SUBORDINATES)
 
 
+async def check_tasks_can_be_created(
+    user: User, company_id: int, items: list[TaskCreate], session: AsyncSession
+) -> tuple[list[int], dict[int, str]]:
+    executor_ids = list({item.executor_id for item in items})
+    memberships = await membership_crud.get_multi_by_users_and_company(executor_ids, company_id, session)
+    allowed = set(memberships)
+    if not user.is_superuser:
+        manager_membership = await check_manager_in_company(user.id, company_id, session)
+        if manager_membership.role == UserRole.MANAGER:
+            allowed = {user_id for user_id, membership in memberships.items() if membership.manager_id == user.id}
+            if settings.manager_chain_assignment:
+                allowed |= await membership_crud.get_subordinate_ids(user.id, list(memberships), company_id, session)
+    accepted, rejected = [], {}
+    for index, item in enumerate(items):
+        if item.executor_id not in memberships:
+            rejected[index] = NOT_FOUND_USER_IN_COMPANY.format(item.executor_id, company_id)
+        elif item.executor_id not in allowed:
+            rejected[index] = ONLY_SUBORDINATES
+        else:
+            accepted.append(index)
+    return accepted, rejected
+
+
+async def check_tasks_can_be_updated(
+    user: User, company_id: int, items: list[TaskBatchUpdateItem], session: AsyncSession
+) -> tuple[list[int], dict[int, str]]:
+    tasks = await task_crud.get_multi_by_ids([item.id for item in items], company_id, session)
+    membership = await membership_crud.get_by_user_and_company(user.id, company_id, session)
+    is_admin = user.is_superuser or bool(membership and membership.role == UserRole.ADMIN)
+    accepted, rejected, seen = [], {}, set()
+    for index, item in enumerate(items):
+        task = tasks.get(item.id)
+        if item.id in seen:
+            rejected[index] = DUPLICATE_BATCH_ITEM.format(item.id)
+        elif task is None:
+            rejected[index] = NOT_FOUND_IN_COMPANY.format(Task.__name__, item.id, company_id)
+        elif is_admin or user.id == task.author_id:
+            accepted.append(index)
+        elif user.id != task.executor_id:
+            rejected[index] = CANNOT_EDIT_TASK.format(user.id, task.id)
+        elif item.model_dump(exclude_unset=True).keys() - {'id', 'status'}:
+            rejected[index] = EXECUTOR_ONLY_STATUS
+        else:
+            accepted.append(index)
+        seen.add(item.id)
+    return accepted, rejected
+
+
 async def check_can_update_task(user: User, company_id: int, task: Task, obj_in: TaskUpdate, session: AsyncSession):
     if await has_full_access(user, company_id, task, session):
         return
@@ -176,6 +278,55 @@ async def check_can_evaluate_task(user: User, company_id: int, task_id: int, ses
 
 
 async def check_user_is_not_busy(user_id: int, start: datetime, end: datetime, session: AsyncSession) -> None:
+    await attendee_crud.lock_users_schedule([user_id], session)
     meetings = await meeting_crud.get_user_meetings_at_the_same_time(user_id, start, end, session)
     if meetings:
         raise HTTPException(status_code=HTTPStatus.UNPROCESSABLE_ENTITY, detail=USER_IS_BUSY.format(str(meetings)))
+
+
+def check_cursor(cursor: str, *types) -> tuple:
+    try:
+        values = decode_cursor(cursor)
+        if len(values) != len(types):
+            raise ValueError(cursor)
+        return tuple(
+            datetime.fromisoformat(value) if type_ is datetime else type_(value) for type_, value in zip(types, values)
+        )
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail=INVALID_CURSOR.format(cursor))
+
+
+def check_calendar_range(date_from: datetime, date_to: datetime) -> None:
+    if date_to <= date_from:
+        raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail=INVALID_PERIOD)
+
+
+async def check_users_in_company(user_ids: list[int], company_id: int, session: AsyncSession) -> None:
+    members = await membership_crud.get_user_ids_in_company(user_ids, company_id, session)
+    for user_id in user_ids:
+        if user_id not in members:
+            raise HTTPException(
+                status_code=HTTPStatus.NOT_FOUND, detail=NOT_FOUND_USER_IN_COMPANY.format(user_id, company_id)
+            )
+
+
+async def check_users_can_attend(
+    meeting: Meeting, user_ids: list[int], session: AsyncSession
+) -> tuple[list[int], dict[int, str]]:
+    await attendee_crud.lock_users_schedule(user_ids, session)
+    members = await membership_crud.get_user_ids_in_company(user_ids, meeting.company_id, session)
+    attendees = await attendee_crud.get_user_ids_in_meeting(meeting.id, user_ids, session)
+    busy = await meeting_crud.get_users_meetings_at_the_same_time(
+        user_ids, meeting.start_at, meeting.end_at, session, exclude_id=meeting.id
+    )
+    accepted, rejected = [], {}
+    for user_id in user_ids:
+        if user_id not in members:
+            rejected[user_id] = NOT_FOUND_USER_IN_COMPANY.format(user_id, meeting.company_id)
+        elif user_id in attendees:
+            rejected[user_id] = USER_IN_MEETINGS_EXISTS.format(user_id, meeting.id)
+        elif user_id in busy:
+            rejected[user_id] = USER_IS_BUSY.format(str(busy[user_id]))
+        else:
+            accepted.append(user_id)
+    return accepted, rejected
@@ -1,6 +1,9 @@
 from app.core.db import Base  # noqa
 from app.models.user import User  # noqa
 from app.models.company import Company, Department, UserCompanyMembership, CompanyNews, Invite  # noqa
+from app.models.company import DepartmentClosure, InviteImport, ManagerClosure  # noqa
 from app.models.task import Task, TaskComment  # noqa
-from app.models.motivation import Rating  # noqa
+from app.models.motivation import Rating, RatingRollup  # noqa
 from app.models.meeting import MeetingAttendee, Meeting  # noqa
+from app.models.mail import MailOutbox  # noqa
+from app.models.job import JobRun  # noqa
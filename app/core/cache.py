@@ -0,0 +1,128 @@
+import asyncio
+import json
+from collections import OrderedDict
+from contextlib import suppress
+from time import monotonic
+
+import asyncpg
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.db import use_primary
+
+MISSING = object()
+STALE_KEYS = 'stale_cache_keys'
+
+
+class TTLCache:
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.version = 0
+        self._data = OrderedDict()
+
+    def get(self, key):
+        item = self._data.get(key)
+        if item is None:
+            return MISSING
+        expires_at, value = item
+        if expires_at < monotonic():
+            del self._data[key]
+            return MISSING
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key, value, version: int | None = None) -> None:
+        if version is not None and version != self.version:
+            return
+        self._data[key] = (monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key) -> None:
+        self.version += 1
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self.version += 1
+        self._data.clear()
+
+
+class CacheInvalidator:
+    def __init__(self, backend: str, interval: float):
+        self.backend = backend
+        self.interval = interval
+        self.caches: dict[str, TTLCache] = {}
+        self.connection: asyncpg.Connection | None = None
+        self.task: asyncio.Task | None = None
+
+    def register(self, channel: str, cache: TTLCache) -> TTLCache:
+        self.caches[channel] = cache
+        return cache
+
+    async def start(self) -> None:
+        if self.backend == 'postgres':
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self.task
+            self.task = None
+        self.disconnect()
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await self.listen()
+            except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError):
+                self.disconnect()
+            await asyncio.sleep(self.interval)
+
+    async def listen(self) -> None:
+        if self.connection is not None and not self.connection.is_closed():
+            await self.connection.execute('SELECT 1')
+            return
+        self.disconnect()
+        self.connection = await asyncpg.connect(settings.asyncpg_dsn)
+        for channel in self.caches:
+            await self.connection.add_listener(channel, self.on_notify)
+        for cache in self.caches.values():
+            cache.clear()
+
+    def disconnect(self) -> None:
+        if self.connection is not None:
+            self.connection.terminate()
+            self.connection = None
+
+    async def invalidate(self, channel: str, keys: set, session: AsyncSession) -> None:
+        await session.run_sync(self.publish, channel, keys)
+
+    def publish(self, session: Session, channel: str, keys: set) -> None:
+        session.info.setdefault(STALE_KEYS, {}).setdefault(channel, set()).update(keys)
+        if self.backend == 'postgres':
+            use_primary(session)
+            session.execute(select(func.pg_notify(channel, json.dumps(sorted(keys)))))
+
+    def on_notify(self, connection, pid: int, channel: str, payload: str) -> None:
+        for key in json.loads(payload):
+            self.caches[channel].delete(tuple(key) if isinstance(key, list) else key)
+
+
+invalidator = CacheInvalidator(settings.cache_invalidation_backend, settings.cache_invalidation_interval)
+
+
+@event.listens_for(Session, 'after_commit')
+def drop_stale_keys(session: Session) -> None:
+    for channel, keys in session.info.pop(STALE_KEYS, {}).items():
+        for key in keys:
+            invalidator.caches[channel].delete(key)
+
+
+@event.listens_for(Session, 'after_rollback')
+def forget_stale_keys(session: Session) -> None:
+    session.info.pop(STALE_KEYS, None)
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import EmailStr
 from pydantic_settings import BaseSettings
 
@@ -12,6 +14,8 @@ class Settings(BaseSettings):
     postgres_server: str
     postgres_port: int
     postgres_db: str
+    postgres_replica_server: str | None = None
+    postgres_replica_port: int | None = None
 
     secret: str
 
@@ -21,16 +25,75 @@ class Settings(BaseSettings):
     mail_port: int
     mail_server: str
     mail_from_name: str
+    mail_starttls: bool = False
+    mail_ssl_tls: bool = True
+    mail_use_credentials: bool = True
+    mail_validate_certs: bool = True
+    mail_outbox_batch_size: int = 100
+    mail_outbox_poll_interval: float = 5
+    mail_outbox_retry_delay: int = 60
+    mail_outbox_max_attempts: int = 8
+
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30
+    db_pool_recycle: int = 30 * 60
+    db_pool_pre_ping: bool = True
+    db_pool_warm_up: bool = True
+    db_statement_cache_size: int = 100
+    db_statement_timeout: int = 0
+
+    cache_invalidation_backend: Literal['local', 'postgres'] = 'local'
+    cache_invalidation_interval: float = 15
+    membership_cache_size: int = 10_000
+    membership_cache_ttl: int = 60
+    stateless_auth: bool = True
+    user_cache_size: int = 10_000
+    user_cache_ttl: int = 30
+
+    manager_chain_assignment: bool = False
+
+    password_hash_workers: int = 2
+    password_hash_queue_size: int = 64
+
+    scheduler_leader_interval: float = 15
 
     run_first_migration: bool = False
     first_superuser_email: EmailStr | None = None
     first_superuser_password: str | None = None
 
+    @property
+    def asyncpg_dsn(self) -> str:
+        return (
+            f'postgresql://{self.postgres_user}:{self.postgres_password}'
+            f'@{self.postgres_server}:{self.postgres_port}/{self.postgres_db}'
+        )
+
     @property
     def database_url(self) -> str:
+        return self.asyncpg_dsn.replace('postgresql://', 'postgresql+asyncpg://', 1)
+
+    @property
+    def replica_database_url(self) -> str | None:
+        if not self.postgres_replica_server:
+            return None
         return (
             f'postgresql+asyncpg://{self.postgres_user}:{self.postgres_password}'
-            f'@{self.postgres_server}:{self.postgres_port}/{self.postgres_db}'
+            f'@{self.postgres_replica_server}:{self.postgres_replica_port or self.postgres_port}/{self.postgres_db}'
+        )
+
+    @property
+    def engine_options(self) -> dict:
+        return dict(
+            pool_size=self.db_pool_size,
+            max_overflow=self.db_max_overflow,
+            pool_timeout=self.db_pool_timeout,
+            pool_recycle=self.db_pool_recycle,
+            pool_pre_ping=self.db_pool_pre_ping,
+            connect_args=dict(
+                prepared_statement_cache_size=self.db_statement_cache_size,
+                server_settings=dict(statement_timeout=str(self.db_statement_timeout)),
+            ),
         )
 
     @property
@@ -42,10 +105,10 @@ class Settings(BaseSettings):
             MAIL_PORT=self.mail_port,
             MAIL_SERVER=self.mail_server,
             MAIL_FROM_NAME=self.mail_from_name,
-            MAIL_STARTTLS=False,
-            MAIL_SSL_TLS=True,
-            USE_CREDENTIALS=True,
-            VALIDATE_CERTS=True,
+            MAIL_STARTTLS=self.mail_starttls,
+            MAIL_SSL_TLS=self.mail_ssl_tls,
+            USE_CREDENTIALS=self.mail_use_credentials,
+            VALIDATE_CERTS=self.mail_validate_certs,
         )
 
     class Config:
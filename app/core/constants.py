@@ -13,8 +13,36 @@ NEWS_BODY_MAX_LENGTH = 4000
 INVITE_CODE_LENGTH = 6
 INVITE_CODE_CHARS = ascii_letters + digits
 MAX_INVITE_CODE_ATTEMPTS = 5
+MAX_INVITE_IMPORT_ROWS = 10_000
+INVITE_IMPORT_CHUNK = 500
+INVITE_IMPORT_LEASE = 5 * 60
+INVITE_IMPORT_POLL_INTERVAL = 5
 INVITE_CODE_DAYS_TTL = 1
 TIME_CLEANUP_INVITES = {'hour': 0, 'minute': 0}
+INVITE_CLEANUP_BATCH = 5_000
+INVITE_CLEANUP_PAUSE = 0.5
+
+SCHEDULER_LEADER_LOCK = 2
+JOB_ID_MAX_LENGTH = 100
+DEFAULT_JOB_RUNS_LIMIT = 50
+
+MAIL_SUBJECT_MAX_LENGTH = 255
+MAIL_CLAIM_LEASE = 5 * 60
+MAIL_MAX_RETRY_DELAY = 6 * 60 * 60
 
 MEETING_TITLE_MAX_LENGTH = 255
 MEETING_DESC_MAX_LENGTH = 4000
+MEETING_SCHEDULE_LOCK = 1
+MAX_MEETING_INVITES = 500
+MAX_FREE_SLOTS = 20
+MAX_TASK_BATCH = 500
+
+RATING_SCORES = range(1, 6)
+RATING_CRITERIA = ('timeliness', 'completeness', 'quality')
+RATING_PERCENTILES = (25, 50, 75, 90)
+DEFAULT_LEADERBOARD_SIZE = 10
+MAX_LEADERBOARD_SIZE = 100
+
+DEFAULT_PAGE_LIMIT = 50
+MAX_PAGE_LIMIT = 500
+NEXT_CURSOR_HEADER = 'X-Next-Cursor'
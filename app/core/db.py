@@ -1,23 +1,143 @@
-from sqlalchemy import Column, Integer
+from contextlib import AsyncExitStack
+from contextvars import ContextVar
+from time import perf_counter
+
+from sqlalchemy import Column, Integer, Select
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import declarative_base, declared_attr, sessionmaker
+from sqlalchemy.orm import Session, declarative_base, declared_attr, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.core.config import settings
 
 
 class PreBase:
     id = Column(Integer, primary_key=True)
+    __mapper_args__ = {'eager_defaults': True}
 
     @declared_attr
     def __tablename__(cls):
         return cls.__name__.lower()
 
 
+class PoolMetrics:
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def observe(self, wait: float, timed_out: bool = False) -> None:
+        self.checkouts += not timed_out
+        self.timeouts += timed_out
+        self.wait_total += wait
+        self.wait_max = max(self.wait_max, wait)
+
+    def snapshot(self, pool: AsyncAdaptedQueuePool) -> dict:
+        attempts = self.checkouts + self.timeouts
+        return dict(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+            max_overflow=settings.db_max_overflow,
+            checkouts=self.checkouts,
+            timeouts=self.timeouts,
+            wait_total=self.wait_total,
+            wait_avg=self.wait_total / attempts if attempts else 0.0,
+            wait_max=self.wait_max,
+        )
+
+
+class MeteredQueuePool(AsyncAdaptedQueuePool):
+    def __init__(self, creator, metrics: PoolMetrics | None = None, **kwargs):
+        super().__init__(creator, **kwargs)
+        self.metrics = metrics or PoolMetrics()
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def _do_get(self):
+        started = perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.observe(perf_counter() - started, timed_out=True)
+            raise
+        self.metrics.observe(perf_counter() - started)
+        return connection
+
+
+def create_engine(url: str, name: str):
+    return create_async_engine(
+        url, poolclass=MeteredQueuePool, pool_logging_name=name, metrics=PoolMetrics(), **settings.engine_options
+    )
+
+
+class RoutingSession(Session):
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._flushing or not isinstance(clause, Select):
+            self.info[USE_PRIMARY] = True
+        elif (
+            self.info.get(USE_REPLICA)
+            and not self.info.get(USE_PRIMARY)
+            and not clause.get_execution_options().get(USE_PRIMARY)
+            and clause._for_update_arg is None
+        ):
+            return replica_engine.sync_engine
+        return engine.sync_engine
+
+
+USE_PRIMARY = 'use_primary'
+USE_REPLICA = 'use_replica'
+request_sessions: ContextVar[list[AsyncSession] | None] = ContextVar('request_sessions', default=None)
 Base = declarative_base(cls=PreBase)
-engine = create_async_engine(settings.database_url)
-AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession)
+engine = create_engine(settings.database_url, 'primary')
+replica_engine = create_engine(settings.replica_database_url, 'replica') if settings.replica_database_url else engine
+engines = dict(primary=engine) | (dict(replica=replica_engine) if replica_engine is not engine else {})
+AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, sync_session_class=RoutingSession, expire_on_commit=False)
+ReadSessionLocal = sessionmaker(
+    engine, class_=AsyncSession, sync_session_class=RoutingSession, expire_on_commit=False, info={USE_REPLICA: True}
+)
+
+
+def track_session(session: AsyncSession) -> AsyncSession:
+    sessions = request_sessions.get()
+    if sessions is not None:
+        sessions.append(session)
+    return session
+
+
+async def release_sessions() -> None:
+    for session in request_sessions.get() or ():
+        await session.close()
 
 
 async def get_async_session():
-    async with AsyncSessionLocal() as session:
+    async with track_session(AsyncSessionLocal()) as session:
         yield session
+
+
+def use_primary(session: AsyncSession) -> None:
+    session.info[USE_PRIMARY] = True
+
+
+def on_primary(query: Select) -> Select:
+    return query.execution_options(**{USE_PRIMARY: True})
+
+
+def use_replica(session: AsyncSession) -> None:
+    session.info[USE_REPLICA] = True
+
+
+async def warm_up_pool() -> None:
+    async with AsyncExitStack() as stack:
+        for db_engine in engines.values():
+            for _ in range(settings.db_pool_size):
+                await stack.enter_async_context(db_engine.connect())
+
+
+def get_pool_metrics() -> dict:
+    return {name: db_engine.pool.metrics.snapshot(db_engine.pool) for name, db_engine in engines.items()}
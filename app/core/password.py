@@ -0,0 +1,39 @@
+from asyncio import get_running_loop
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+from fastapi import HTTPException
+from fastapi_users.password import PasswordHelper
+
+from app.core.config import settings
+
+HASHER_OVERLOADED = 'Сервер перегружен, повторите попытку позже!'
+
+
+class PasswordHasher:
+    def __init__(self, workers: int, queue_size: int):
+        self.helper = PasswordHelper()
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hasher')
+        self.queue_size = queue_size
+        self.pending = 0
+
+    async def run(self, func, *args):
+        if self.pending >= self.queue_size:
+            raise HTTPException(status_code=HTTPStatus.SERVICE_UNAVAILABLE, detail=HASHER_OVERLOADED)
+        self.pending += 1
+        try:
+            return await get_running_loop().run_in_executor(self.executor, func, *args)
+        finally:
+            self.pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self.run(self.helper.hash, password)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> tuple[bool, str | None]:
+        return await self.run(self.helper.verify_and_update, password, hashed_password)
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_hasher = PasswordHasher(settings.password_hash_workers, settings.password_hash_queue_size)
@@ -1,7 +1,16 @@
+import asyncio
+from contextlib import suppress
+from time import perf_counter
+
+import asyncpg
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 
-from app.core.constants import TIME_CLEANUP_INVITES
+from app.core.config import settings
+from app.core.constants import SCHEDULER_LEADER_LOCK, TIME_CLEANUP_INVITES
+from app.core.db import AsyncSessionLocal
+from app.crud.job import job_run_crud
+from app.models.job import JobStatus
 from app.tasks.invites import cleanup_expired_invites_task
 
 scheduler = AsyncIOScheduler(job_defaults={'coalesce': True, 'max_instances': 1, 'misfire_grace_time': 10 * 60})
@@ -9,7 +18,7 @@ scheduler = AsyncIOScheduler(job_defaults={'coalesce': True, 'max_instances': 1,
 
 def start_scheduler():
     if not scheduler.running:
-        scheduler.start()
+        scheduler.start(paused=True)
 
 
 def stop_scheduler():
@@ -17,7 +26,94 @@ def stop_scheduler():
         scheduler.shutdown()
 
 
+def tracked(job_id: str, func):
+    async def run():
+        if not await scheduler_leader.confirm():
+            return
+        async with AsyncSessionLocal() as session:
+            job_run = await job_run_crud.start(job_id, session)
+            started = perf_counter()
+            try:
+                await func()
+            except Exception as error:
+                await job_run_crud.finish(job_run, JobStatus.FAILED, perf_counter() - started, session, repr(error))
+                raise
+            await job_run_crud.finish(job_run, JobStatus.SUCCESS, perf_counter() - started, session)
+
+    return run
+
+
 def register_jobs():
     scheduler.add_job(
-        cleanup_expired_invites_task, CronTrigger(**TIME_CLEANUP_INVITES), id='cleanup_invites', replace_existing=True
+        tracked('cleanup_invites', cleanup_expired_invites_task),
+        CronTrigger(**TIME_CLEANUP_INVITES),
+        id='cleanup_invites',
+        replace_existing=True,
     )
+
+
+class SchedulerLeader:
+    def __init__(self, lock_key: int, interval: float):
+        self.lock_key = lock_key
+        self.interval = interval
+        self.connection: asyncpg.Connection | None = None
+        self.task: asyncio.Task | None = None
+        self.is_leader = False
+        self.lock = asyncio.Lock()
+
+    async def start(self) -> None:
+        self.task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self.task
+            self.task = None
+        await self.resign()
+
+    async def run(self) -> None:
+        while True:
+            try:
+                async with self.lock:
+                    await self.elect()
+            except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError):
+                await self.resign()
+            await asyncio.sleep(self.interval)
+
+    async def elect(self) -> None:
+        if self.connection is None or self.connection.is_closed():
+            await self.resign()
+            self.connection = await asyncpg.connect(settings.asyncpg_dsn)
+        if self.is_leader:
+            await self.connection.execute('SELECT 1')
+        elif await self.connection.fetchval('SELECT pg_try_advisory_lock($1)', self.lock_key):
+            self.is_leader = True
+            scheduler.resume()
+
+    async def confirm(self) -> bool:
+        held = False
+        with suppress(OSError, TimeoutError, asyncpg.PostgresError, asyncpg.InterfaceError):
+            async with self.lock:
+                if self.is_leader and self.connection is not None and not self.connection.is_closed():
+                    held = await self.connection.fetchval(
+                        "SELECT EXISTS (SELECT 1 FROM pg_locks WHERE locktype = 'advisory' AND pid = pg_backend_pid() "
+                        'AND classid = $1 AND objid = $2 AND objsubid = 1 AND granted)',
+                        self.lock_key >> 32,
+                        self.lock_key & 0xFFFFFFFF,
+                        timeout=self.interval,
+                    )
+        if not held:
+            await self.resign()
+        return held
+
+    async def resign(self) -> None:
+        if self.is_leader and scheduler.running:
+            scheduler.pause()
+        self.is_leader = False
+        if self.connection is not None:
+            self.connection.terminate()
+            self.connection = None
+
+
+scheduler_leader = SchedulerLeader(SCHEDULER_LEADER_LOCK, settings.scheduler_leader_interval)
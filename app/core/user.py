@@ -1,14 +1,22 @@
 from http import HTTPStatus
 
+import jwt
 from fastapi import Depends, HTTPException
+from fastapi.security import OAuth2PasswordRequestForm
 from fastapi_users import BaseUserManager, FastAPIUsers, IntegerIDMixin, InvalidPasswordException
 from fastapi_users.authentication import AuthenticationBackend, BearerTransport, JWTStrategy
+from fastapi_users.exceptions import InvalidID, UserAlreadyExists, UserNotExists
+from fastapi_users.jwt import decode_jwt, generate_jwt
 from fastapi_users_db_sqlalchemy import SQLAlchemyUserDatabase
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 
+from app.core.cache import MISSING, TTLCache, invalidator
 from app.core.config import settings
 from app.core.constants import JWT_LIFETIME, MIN_LEN_PASSWORD, SWAGGER_TOKEN_URL
-from app.core.db import get_async_session
+from app.core.db import get_async_session, on_primary
+from app.core.password import password_hasher
 from app.crud.company import membership_crud
 from app.models.user import User
 from app.schemas.user import UserCreate
@@ -17,13 +25,72 @@ PASSWORD_TOO_SHORT = 'Пароль должен содержать не мене
 PASSWORD_CONTAINS_EMAIL = 'Пароль не должен содержать e-mail!'
 CANNOT_DELETE_WHILE_IN_COMPANY = 'Нельзя удалить пользователя, пока он состоит в компании!'
 
+USER_CACHE_CHANNEL = 'user_cache'
+TOKEN_FIELDS = {'password', 'email', 'is_active', 'is_superuser', 'is_verified'}
+
+token_versions = invalidator.register(USER_CACHE_CHANNEL, TTLCache(settings.user_cache_size, settings.user_cache_ttl))
+
+
+async def get_token_version(user_id: int, session: AsyncSession) -> int | None:
+    token_version = token_versions.get(user_id)
+    if token_version is MISSING:
+        version = token_versions.version
+        token_version = await session.scalar(on_primary(select(User.token_version).where(User.id == user_id)))
+        token_versions.set(user_id, token_version, version)
+    return token_version
+
+
+async def revoke_tokens(user: User, session: AsyncSession) -> None:
+    await invalidator.invalidate(USER_CACHE_CHANNEL, {user.id}, session)
+
 
 async def get_user_db(session: AsyncSession = Depends(get_async_session)):
     yield SQLAlchemyUserDatabase(session, User)
 
 
+class ClaimsJWTStrategy(JWTStrategy):
+    async def read_token(self, token: str | None, user_manager: BaseUserManager[User, int]) -> User | None:
+        if token is None:
+            return None
+        try:
+            data = decode_jwt(token, self.decode_key, self.token_audience, algorithms=[self.algorithm])
+        except jwt.PyJWTError:
+            return None
+        if 'ver' not in data:
+            return await super().read_token(token, user_manager)
+        try:
+            user_id = user_manager.parse_id(data.get('sub'))
+        except InvalidID:
+            return None
+        if await get_token_version(user_id, user_manager.user_db.session) != data['ver']:
+            return None
+        user = User(
+            id=user_id,
+            email=data['email'],
+            is_active=data['is_active'],
+            is_superuser=data['is_superuser'],
+            is_verified=data['is_verified'],
+            token_version=data['ver'],
+        )
+        make_transient_to_detached(user)
+        return user
+
+    async def write_token(self, user: User) -> str:
+        data = {
+            'sub': str(user.id),
+            'aud': self.token_audience,
+            'ver': user.token_version,
+            'email': user.email,
+            'is_active': user.is_active,
+            'is_superuser': user.is_superuser,
+            'is_verified': user.is_verified,
+        }
+        return generate_jwt(data, self.encode_key, self.lifetime_seconds, algorithm=self.algorithm)
+
+
 def get_jwt_strategy() -> JWTStrategy:
-    return JWTStrategy(secret=settings.secret, lifetime_seconds=JWT_LIFETIME)
+    strategy = ClaimsJWTStrategy if settings.stateless_auth else JWTStrategy
+    return strategy(secret=settings.secret, lifetime_seconds=JWT_LIFETIME)
 
 
 auth_backend = AuthenticationBackend(
@@ -38,14 +105,49 @@ class UserManager(IntegerIDMixin, BaseUserManager[User, int]):
         if user.email in password:
             raise InvalidPasswordException(reason=PASSWORD_CONTAINS_EMAIL)
 
+    async def create(self, user_create: UserCreate, safe: bool = False, request=None) -> User:
+        await self.validate_password(user_create.password, user_create)
+        if await self.user_db.get_by_email(user_create.email) is not None:
+            raise UserAlreadyExists()
+        user_dict = user_create.create_update_dict() if safe else user_create.create_update_dict_superuser()
+        user_dict['hashed_password'] = await password_hasher.hash(user_dict.pop('password'))
+        user = await self.user_db.create(user_dict)
+        await self.on_after_register(user, request)
+        return user
+
+    async def authenticate(self, credentials: OAuth2PasswordRequestForm) -> User | None:
+        try:
+            user = await self.get_by_email(credentials.username)
+        except UserNotExists:
+            await password_hasher.hash(credentials.password)
+            return None
+        verified, new_hash = await password_hasher.verify_and_update(credentials.password, user.hashed_password)
+        if not verified:
+            return None
+        if new_hash is not None:
+            await self.user_db.update(user, {'hashed_password': new_hash})
+        return user
+
+    async def _update(self, user: User, update_dict: dict) -> User:
+        revoke = not TOKEN_FIELDS.isdisjoint(update_dict)
+        if update_dict.get('password') is not None:
+            password = update_dict.pop('password')
+            await self.validate_password(password, user)
+            update_dict['hashed_password'] = await password_hasher.hash(password)
+        if revoke:
+            update_dict['token_version'] = User.token_version + 1
+            await revoke_tokens(user, self.user_db.session)
+        return await super()._update(user, update_dict)
+
     async def on_before_delete(self, user: User, request=None) -> None:
         session = self.user_db.session
         if await membership_crud.get_by_attribute('user_id', user.id, session) is not None:
             raise HTTPException(status_code=HTTPStatus.FORBIDDEN, detail=CANNOT_DELETE_WHILE_IN_COMPANY)
+        await revoke_tokens(user, session)
 
 
 async def get_user_manager(user_db=Depends(get_user_db)):
-    yield UserManager(user_db)
+    yield UserManager(user_db, password_hasher.helper)
 
 
 fastapi_users = FastAPIUsers[User, int](get_user_manager, [auth_backend])
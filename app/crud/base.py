@@ -1,15 +1,59 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
 from typing import Optional
 
 from fastapi.encoders import jsonable_encoder
-from sqlalchemy import select
+from sqlalchemy import inspect, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.constants import DEFAULT_PAGE_LIMIT
 from app.models.user import User
 
 
+def encode_cursor(*values) -> str:
+    return urlsafe_b64encode(json.dumps(jsonable_encoder(values)).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> list:
+    try:
+        values = json.loads(urlsafe_b64decode(cursor.encode()))
+    except (BinasciiError, UnicodeDecodeError, ValueError):
+        raise ValueError(cursor)
+    if not isinstance(values, list):
+        raise ValueError(cursor)
+    return values
+
+
+def has_changes(obj, *keys: str) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[key].history.has_changes() for key in keys)
+
+
 class CRUDBase:
-    def __init__(self, model):
+    def __init__(self, model, sort_keys: tuple = ()):
         self.model = model
+        self.sort_keys = (*sort_keys, model.id)
+
+    @property
+    def cursor_types(self) -> tuple:
+        return tuple(key.type.python_type for key in self.sort_keys)
+
+    async def get_page(
+        self, session: AsyncSession, *filters, limit: int | None = None, after: tuple | None = None
+    ) -> tuple[list, str | None]:
+        query = select(self.model).where(*filters).order_by(*self.sort_keys)
+        if limit is None and after is None:
+            return (await session.execute(query)).scalars().all(), None
+        limit = limit or DEFAULT_PAGE_LIMIT
+        query = query.limit(limit + 1)
+        if after is not None:
+            query = query.where(tuple_(*self.sort_keys) > tuple_(*after))
+        db_objs = (await session.execute(query)).scalars().all()
+        if len(db_objs) <= limit:
+            return db_objs, None
+        last = db_objs[limit - 1]
+        return db_objs[:limit], encode_cursor(*(getattr(last, key.key) for key in self.sort_keys))
 
     async def get(self, obj_id: int, session: AsyncSession):
         db_obj = await session.execute(select(self.model).where(self.model.id == obj_id))
@@ -19,30 +63,23 @@ class CRUDBase:
         db_obj = await session.execute(select(self.model).where(getattr(self.model, attr_name) == attr_value))
         return db_obj.scalars().first()
 
-    async def get_multi(self, session: AsyncSession):
-        db_objs = await session.execute(select(self.model))
-        return db_objs.scalars().all()
-
     async def create(self, obj_in, session: AsyncSession, user: Optional[User] = None, commit: bool = True):
-        obj_in_data = obj_in.dict()
+        obj_in_data = obj_in.model_dump()
         if user is not None:
             obj_in_data['user_id'] = user.id
         db_obj = self.model(**obj_in_data)
         session.add(db_obj)
         if commit:
             await session.commit()
-            await session.refresh(db_obj)
         return db_obj
 
     async def update(self, db_obj, obj_in, session: AsyncSession):
-        obj_data = jsonable_encoder(db_obj)
-        update_data = obj_in.dict(exclude_unset=True)
-        for field in obj_data:
-            if field in update_data:
-                setattr(db_obj, field, update_data[field])
+        columns = inspect(self.model).column_attrs.keys()
+        for field, value in obj_in.model_dump(exclude_unset=True).items():
+            if field in columns:
+                setattr(db_obj, field, value)
         session.add(db_obj)
         await session.commit()
-        await session.refresh(db_obj)
         return db_obj
 
     async def remove(self, db_obj, session: AsyncSession):
@@ -1,6 +1,9 @@
-from sqlalchemy import func, text
+from datetime import datetime
+from enum import StrEnum
+
+from sqlalchemy import DateTime, Integer, String, cast, func, literal_column, null, text, tuple_, union_all
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.sql import select
+from sqlalchemy.sql import Select, select
 
 from app.models.company import CompanyNews
 from app.models.meeting import Meeting, MeetingAttendee
@@ -8,55 +11,122 @@ from app.models.task import Task
 from app.schemas.calendar import CalendarScope
 
 
+class EventKind(StrEnum):
+    NEWS = 'news'
+    TASK = 'task'
+    MEETING = 'meeting'
+
+
 class CalendarService:
     interval = {'day': text("INTERVAL '1 day'"), 'month': text("INTERVAL '1 month'"), 'year': text("INTERVAL '1 year'")}
 
-    def __init__(self, company_id: int, user_id: int, scope: CalendarScope, session: AsyncSession):
+    def __init__(self, company_id: int, user_id: int, window_start, window_end, session: AsyncSession):
         self.company_id = company_id
         self.user_id = user_id
-        self.scope = scope.value
-        self.window_start = func.date_trunc(self.scope, func.now())
-        self.window_end = self.window_start + self.interval[self.scope]
+        self.window_start = window_start
+        self.window_end = window_end
         self.session = session
 
-    async def fetch_news(self) -> list[CompanyNews]:
-        news_query = (
-            select(CompanyNews)
-            .where(
-                CompanyNews.company_id == self.company_id,
-                CompanyNews.published_at >= self.window_start,
-                CompanyNews.published_at < self.window_end,
-            )
-            .order_by(CompanyNews.published_at)
+    @classmethod
+    def for_scope(cls, company_id: int, user_id: int, scope: CalendarScope, session: AsyncSession):
+        window_start = func.date_trunc(scope.value, func.now())
+        return cls(company_id, user_id, window_start, window_start + cls.interval[scope.value], session)
+
+    def news_query(self) -> Select:
+        return select(
+            literal_column(f"'{EventKind.NEWS}'", String).label('kind'),
+            CompanyNews.id,
+            CompanyNews.company_id,
+            CompanyNews.author_id,
+            cast(null(), Integer).label('executor_id'),
+            cast(null(), Task.status.type).label('status'),
+            CompanyNews.title,
+            CompanyNews.body,
+            CompanyNews.published_at.label('start_at'),
+            cast(null(), DateTime).label('end_at'),
+        ).where(
+            CompanyNews.company_id == self.company_id,
+            CompanyNews.published_at >= self.window_start,
+            CompanyNews.published_at < self.window_end,
         )
-        news_result = await self.session.execute(news_query)
-        return news_result.scalars().all()
 
-    async def fetch_tasks(self) -> list[Task]:
-        task_query = (
-            select(Task)
-            .where(
-                Task.company_id == self.company_id,
-                Task.start_at < self.window_end,
-                Task.end_at > self.window_start,
-                Task.executor_id == self.user_id,
-            )
-            .order_by(Task.start_at)
+    def tasks_query(self) -> Select:
+        return select(
+            literal_column(f"'{EventKind.TASK}'", String).label('kind'),
+            Task.id,
+            Task.company_id,
+            Task.author_id,
+            Task.executor_id,
+            Task.status,
+            Task.title,
+            Task.body,
+            Task.start_at,
+            Task.end_at,
+        ).where(
+            Task.company_id == self.company_id,
+            Task.start_at < self.window_end,
+            Task.end_at > self.window_start,
+            Task.executor_id == self.user_id,
         )
-        task_result = await self.session.execute(task_query)
-        return task_result.scalars().all()
 
-    async def fetch_meetings(self) -> list[Meeting]:
-        meeting_query = (
-            select(Meeting)
+    def meetings_query(self) -> Select:
+        return (
+            select(
+                literal_column(f"'{EventKind.MEETING}'", String).label('kind'),
+                Meeting.id,
+                Meeting.company_id,
+                Meeting.author_id,
+                cast(null(), Integer).label('executor_id'),
+                cast(null(), Task.status.type).label('status'),
+                Meeting.title,
+                Meeting.description.label('body'),
+                Meeting.start_at,
+                Meeting.end_at,
+            )
+            .join(MeetingAttendee, MeetingAttendee.meeting_id == Meeting.id)
             .where(
                 Meeting.company_id == self.company_id,
                 Meeting.start_at < self.window_end,
                 Meeting.end_at > self.window_start,
+                MeetingAttendee.user_id == self.user_id,
             )
-            .outerjoin(MeetingAttendee, MeetingAttendee.meeting_id == Meeting.id)
-            .where(MeetingAttendee.user_id == self.user_id)
-            .order_by(Meeting.start_at)
         )
-        meeting_result = await self.session.execute(meeting_query)
-        return meeting_result.scalars().all()
+
+    @staticmethod
+    def to_event(row) -> dict:
+        event = dict(id=row.id, company_id=row.company_id, author_id=row.author_id, title=row.title)
+        if row.kind == EventKind.NEWS:
+            return event | dict(body=row.body, published_at=row.start_at)
+        if row.kind == EventKind.TASK:
+            return event | dict(
+                body=row.body,
+                executor_id=row.executor_id,
+                status=row.status,
+                start_at=row.start_at,
+                end_at=row.end_at,
+            )
+        return event | dict(description=row.body, start_at=row.start_at, end_at=row.end_at)
+
+    @classmethod
+    def group_events(cls, rows) -> dict[str, list[dict]]:
+        grouped = {EventKind.NEWS: [], EventKind.TASK: [], EventKind.MEETING: []}
+        for row in rows:
+            grouped[EventKind(row.kind)].append(cls.to_event(row))
+        return dict(news=grouped[EventKind.NEWS], tasks=grouped[EventKind.TASK], meetings=grouped[EventKind.MEETING])
+
+    def events_query(self) -> Select:
+        events = union_all(self.news_query(), self.tasks_query(), self.meetings_query()).subquery()
+        return select(events).order_by(events.c.start_at, events.c.kind, events.c.id)
+
+    async def fetch_events(self) -> dict[str, list[dict]]:
+        result = await self.session.execute(self.events_query())
+        return self.group_events(result)
+
+    async def fetch_page(self, limit: int, after: tuple[datetime, str, int] | None = None) -> tuple[dict, tuple | None]:
+        query = self.events_query()
+        events = query.selected_columns
+        if after is not None:
+            query = query.where(tuple_(events.start_at, events.kind, events.id) > tuple_(*after))
+        rows = (await self.session.execute(query.limit(limit + 1))).all()
+        last = rows[limit - 1] if len(rows) > limit else None
+        return self.group_events(rows[:limit]), (last.start_at, last.kind, last.id) if last is not None else None
@@ -1,26 +1,63 @@
+import asyncio
 from datetime import datetime, timedelta
 
-from sqlalchemy import delete, func, select
+from sqlalchemy import delete, event, func, inspect, or_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import Session, aliased, make_transient_to_detached, selectinload
+from sqlalchemy.orm.base import NO_VALUE
 
-from app.core.constants import INVITE_CODE_DAYS_TTL
-from app.crud.base import CRUDBase
-from app.models.company import Company, CompanyNews, Department, Invite, UserCompanyMembership, UserRole
+from app.core.cache import MISSING, TTLCache, invalidator
+from app.core.config import settings
+from app.core.constants import (
+    INVITE_CLEANUP_BATCH,
+    INVITE_CLEANUP_PAUSE,
+    INVITE_CODE_DAYS_TTL,
+    INVITE_IMPORT_LEASE,
+)
+from app.core.db import on_primary
+from app.crud.base import CRUDBase, has_changes
+from app.models.company import (
+    Company,
+    CompanyNews,
+    Department,
+    DepartmentClosure,
+    ImportStatus,
+    Invite,
+    InviteImport,
+    ManagerClosure,
+    UserCompanyMembership,
+    UserRole,
+)
 from app.models.user import User
 from app.schemas.company import CompanyNewsCreate, DepartmentCreate, InviteCreate
 
+MEMBERSHIP_CACHE = 'memberships'
+MEMBERSHIP_CACHE_CHANNEL = 'membership_cache'
+DEPARTMENT_TREE_PENDING = 'department_tree_pending'
+MANAGER_TREE_PENDING = 'manager_tree_pending'
+
+membership_cache = invalidator.register(
+    MEMBERSHIP_CACHE_CHANNEL, TTLCache(settings.membership_cache_size, settings.membership_cache_ttl)
+)
+
 
 class CRUDCompanyBase(CRUDBase):
-    async def get_multi_by_company(self, company_id: int, session: AsyncSession):
-        result = await session.execute(select(self.model).where(self.model.company_id == company_id))
-        return result.scalars().all()
+    async def get_multi_by_company(
+        self, company_id: int, session: AsyncSession, limit: int | None = None, after: tuple | None = None
+    ):
+        return await self.get_page(session, self.model.company_id == company_id, limit=limit, after=after)
+
+    async def get_ids_in_company(self, obj_ids: list[int], company_id: int, session: AsyncSession) -> set[int]:
+        result = await session.scalars(
+            select(self.model.id).where(self.model.id.in_(obj_ids), self.model.company_id == company_id)
+        )
+        return set(result)
 
     async def _create_and_return(self, data: dict, session: AsyncSession):
         db_obj = self.model(**data)
         session.add(db_obj)
         await session.commit()
-        await session.refresh(db_obj)
         return db_obj
 
 
@@ -33,19 +70,192 @@ class CRUDCompany(CRUDCompanyBase):
         return result.scalars().all()
 
 
+def subtree_ids(department_id: int):
+    closure = aliased(DepartmentClosure)
+    return select(closure.descendant_id).where(closure.ancestor_id == department_id)
+
+
+def detach_subtree(department_id: int, inclusive: bool = False):
+    ancestors = aliased(DepartmentClosure)
+    query = select(ancestors.ancestor_id).where(ancestors.descendant_id == department_id)
+    if not inclusive:
+        query = query.where(ancestors.ancestor_id != department_id)
+    return delete(DepartmentClosure.__table__).where(
+        DepartmentClosure.descendant_id.in_(subtree_ids(department_id)),
+        DepartmentClosure.ancestor_id.in_(query),
+    )
+
+
+def attach_subtree(department_id: int, parent_id: int):
+    parent, subtree = aliased(DepartmentClosure), aliased(DepartmentClosure)
+    return insert(DepartmentClosure.__table__).from_select(
+        ['ancestor_id', 'descendant_id', 'depth'],
+        select(parent.ancestor_id, subtree.descendant_id, parent.depth + subtree.depth + 1).where(
+            parent.descendant_id == parent_id, subtree.ancestor_id == department_id
+        ),
+    )
+
+
+def detach_reports(user_id: int, company_id: int | None = None, inclusive: bool = False):
+    subtree, ancestors = aliased(ManagerClosure), aliased(ManagerClosure)
+    subtree_query = select(subtree.company_id, subtree.descendant_id).where(subtree.ancestor_id == user_id)
+    ancestors_query = select(ancestors.company_id, ancestors.ancestor_id).where(ancestors.descendant_id == user_id)
+    if company_id is not None:
+        subtree_query = subtree_query.where(subtree.company_id == company_id)
+        ancestors_query = ancestors_query.where(ancestors.company_id == company_id)
+    if not inclusive:
+        ancestors_query = ancestors_query.where(ancestors.ancestor_id != user_id)
+    return delete(ManagerClosure.__table__).where(
+        tuple_(ManagerClosure.company_id, ManagerClosure.descendant_id).in_(subtree_query),
+        tuple_(ManagerClosure.company_id, ManagerClosure.ancestor_id).in_(ancestors_query),
+    )
+
+
+def attach_reports(query):
+    return (
+        insert(ManagerClosure.__table__)
+        .from_select(['company_id', 'ancestor_id', 'descendant_id', 'depth'], query)
+        .on_conflict_do_nothing(constraint='unique_manager_closure')
+    )
+
+
+def attach_to_manager(user_id: int, company_id: int, manager_id: int):
+    manager, subtree = aliased(ManagerClosure), aliased(ManagerClosure)
+    return attach_reports(
+        select(manager.company_id, manager.ancestor_id, subtree.descendant_id, manager.depth + subtree.depth + 1).where(
+            manager.company_id == company_id,
+            manager.descendant_id == manager_id,
+            subtree.company_id == company_id,
+            subtree.ancestor_id == user_id,
+        )
+    )
+
+
+def attach_direct_reports(user_id: int, company_id: int):
+    manager, subtree = aliased(ManagerClosure), aliased(ManagerClosure)
+    return attach_reports(
+        select(manager.company_id, manager.ancestor_id, subtree.descendant_id, manager.depth + subtree.depth + 1)
+        .join(UserCompanyMembership, UserCompanyMembership.user_id == subtree.ancestor_id)
+        .where(
+            manager.company_id == company_id,
+            manager.descendant_id == user_id,
+            subtree.company_id == company_id,
+            UserCompanyMembership.company_id == company_id,
+            UserCompanyMembership.manager_id == user_id,
+            UserCompanyMembership.user_id != user_id,
+        )
+    )
+
+
 class CRUDDepartment(CRUDCompanyBase):
     async def create(self, obj_in: DepartmentCreate, company_id: int, session: AsyncSession):
         data = obj_in.model_dump()
         data['company_id'] = company_id
         return await self._create_and_return(data, session)
 
+    async def is_in_subtree(self, department_id: int, root_id: int, session: AsyncSession) -> bool:
+        result = await session.execute(
+            select(DepartmentClosure.id).where(
+                DepartmentClosure.ancestor_id == root_id, DepartmentClosure.descendant_id == department_id
+            )
+        )
+        return result.first() is not None
+
+    async def get_org_chart(self, company_id: int, session: AsyncSession) -> list[dict]:
+        result = await session.execute(
+            select(
+                self.model.id,
+                self.model.name,
+                self.model.parent_id,
+                func.count(UserCompanyMembership.id).filter(DepartmentClosure.depth == 0).label('members_count'),
+                func.count(UserCompanyMembership.id).label('subtree_members_count'),
+            )
+            .join(DepartmentClosure, DepartmentClosure.ancestor_id == self.model.id)
+            .outerjoin(UserCompanyMembership, UserCompanyMembership.department_id == DepartmentClosure.descendant_id)
+            .where(self.model.company_id == company_id)
+            .group_by(self.model.id)
+            .order_by(self.model.name, self.model.id)
+        )
+        nodes = {row.id: dict(row._mapping, children=[]) for row in result}
+        roots = []
+        for node in nodes.values():
+            parent = nodes.get(node['parent_id'])
+            (parent['children'] if parent is not None else roots).append(node)
+        return roots
+
 
 class CRUDMembership(CRUDCompanyBase):
+    async def get_multi_by_department_subtree(
+        self, department_id: int, session: AsyncSession, limit: int | None = None, after: tuple | None = None
+    ):
+        return await self.get_page(
+            session, self.model.department_id.in_(subtree_ids(department_id)), limit=limit, after=after
+        )
+
     async def get_by_user_and_company(self, user_id: int, company_id: int, session: AsyncSession):
+        cache = session.info.setdefault(MEMBERSHIP_CACHE, {})
+        if (user_id, company_id) not in cache:
+            cache[user_id, company_id] = await self._get_shared(user_id, company_id, session)
+        return cache[user_id, company_id]
+
+    async def _get_shared(self, user_id: int, company_id: int, session: AsyncSession):
+        data = membership_cache.get((user_id, company_id))
+        if data is None:
+            return None
+        if data is not MISSING:
+            db_obj = self.model(**data)
+            make_transient_to_detached(db_obj)
+            return await session.merge(db_obj, load=False)
+        version = membership_cache.version
+        result = await session.execute(
+            on_primary(select(self.model).where(self.model.user_id == user_id, self.model.company_id == company_id))
+        )
+        db_obj = result.scalars().first()
+        membership_cache.set((user_id, company_id), self._snapshot(db_obj), version)
+        return db_obj
+
+    def _snapshot(self, db_obj: UserCompanyMembership | None) -> dict | None:
+        if db_obj is None:
+            return None
+        return {attr.key: getattr(db_obj, attr.key) for attr in inspect(self.model).column_attrs}
+
+    async def is_subordinate(self, user_id: int, manager_id: int, company_id: int, session: AsyncSession) -> bool:
+        result = await session.execute(
+            select(ManagerClosure.id).where(
+                ManagerClosure.company_id == company_id,
+                ManagerClosure.ancestor_id == manager_id,
+                ManagerClosure.descendant_id == user_id,
+                ManagerClosure.depth > 0,
+            )
+        )
+        return result.first() is not None
+
+    async def get_subordinate_ids(
+        self, manager_id: int, user_ids: list[int], company_id: int, session: AsyncSession
+    ) -> set[int]:
+        result = await session.execute(
+            select(ManagerClosure.descendant_id).where(
+                ManagerClosure.company_id == company_id,
+                ManagerClosure.ancestor_id == manager_id,
+                ManagerClosure.descendant_id.in_(user_ids),
+                ManagerClosure.depth > 0,
+            )
+        )
+        return set(result.scalars().all())
+
+    async def get_multi_by_users_and_company(
+        self, user_ids: list[int], company_id: int, session: AsyncSession
+    ) -> dict[int, UserCompanyMembership]:
         result = await session.execute(
-            select(self.model).where(self.model.user_id == user_id, self.model.company_id == company_id)
+            select(self.model).where(self.model.company_id == company_id, self.model.user_id.in_(user_ids))
         )
-        return result.scalars().first()
+        return {membership.user_id: membership for membership in result.scalars()}
+
+    async def get_user_ids_in_company(self, user_ids: list[int], company_id: int, session: AsyncSession) -> set[int]:
+        result = await session.execute(
+            select(self.model.user_id).where(self.model.company_id == company_id, self.model.user_id.in_(user_ids))
+        )
+        return set(result.scalars().all())
 
     async def count_company_admins(self, company_id: int, session: AsyncSession):
         result = await session.execute(
@@ -63,16 +273,198 @@ class CRUDNews(CRUDCompanyBase):
 
 
 class CRUDInvites(CRUDCompanyBase):
-    async def create(self, obj_in: InviteCreate, company_id: int, code: str, session: AsyncSession):
-        data = obj_in.model_dump()
-        data['code'] = code
-        data['company_id'] = company_id
-        data['expires_at'] = datetime.now() + timedelta(days=INVITE_CODE_DAYS_TTL)
-        return await self._create_and_return(data, session)
+    async def create_multi(
+        self, items: list[InviteCreate], codes: list[str], company_id: int, session: AsyncSession
+    ) -> list[Invite]:
+        expires_at = datetime.now() + timedelta(days=INVITE_CODE_DAYS_TTL)
+        rows = [
+            dict(item.model_dump(), code=code, company_id=company_id, expires_at=expires_at)
+            for item, code in zip(items, codes)
+        ]
+        result = await session.scalars(
+            insert(self.model).on_conflict_do_nothing(index_elements=[self.model.code]).returning(self.model), rows
+        )
+        return result.all()
+
+    async def cleanup_expired_invites(
+        self, session: AsyncSession, batch_size: int = INVITE_CLEANUP_BATCH, pause: float = INVITE_CLEANUP_PAUSE
+    ) -> int:
+        expired = (
+            select(self.model.id)
+            .where(self.model.expires_at < datetime.now())
+            .order_by(self.model.expires_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        deleted = 0
+        while True:
+            result = await session.execute(
+                delete(self.model)
+                .where(self.model.id.in_(expired.scalar_subquery()))
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+            deleted += result.rowcount
+            if result.rowcount < batch_size:
+                return deleted
+            await asyncio.sleep(pause)
 
-    async def cleanup_expired_invites(self, session: AsyncSession):
-        await session.execute(delete(self.model).where(self.model.expires_at < datetime.now()))
+
+class CRUDInviteImports(CRUDCompanyBase):
+    async def create_for_company(
+        self,
+        company_id: int,
+        author: User,
+        items: dict[int, InviteCreate],
+        errors: dict[int, str],
+        session: AsyncSession,
+    ) -> InviteImport:
+        return await self._create_and_return(
+            dict(
+                company_id=company_id,
+                author_id=author.id,
+                total=len(items) + len(errors),
+                processed=len(errors),
+                errors=[dict(row=row, reason=reason) for row, reason in sorted(errors.items())],
+                items=[dict(item.model_dump(mode='json'), row=row) for row, item in items.items()],
+            ),
+            session,
+        )
+
+    async def claim(self, session: AsyncSession) -> InviteImport | None:
+        now = datetime.now()
+        due = (
+            select(self.model.id)
+            .where(
+                self.model.status.in_((ImportStatus.PENDING, ImportStatus.RUNNING)),
+                or_(self.model.lease_until.is_(None), self.model.lease_until < now),
+            )
+            .order_by(self.model.created_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        job = await session.scalar(
+            update(self.model)
+            .where(self.model.id.in_(due.scalar_subquery()))
+            .values(status=ImportStatus.RUNNING, lease_until=now + timedelta(seconds=INVITE_IMPORT_LEASE))
+            .returning(self.model)
+        )
         await session.commit()
+        return job
+
+
+@event.listens_for(Session, 'before_flush')
+def detach_departments(session: Session, flush_context, instances) -> None:
+    new = [obj for obj in session.new if isinstance(obj, Department)]
+    moved = [obj for obj in session.dirty if isinstance(obj, Department) and has_changes(obj, 'parent_id', 'parent')]
+    for department in moved:
+        session.execute(detach_subtree(department.id))
+    for obj in session.deleted:
+        if isinstance(obj, Department):
+            session.execute(detach_subtree(obj.id, inclusive=True))
+    if new or moved:
+        session.info[DEPARTMENT_TREE_PENDING] = (new, moved)
+
+
+@event.listens_for(Session, 'after_flush')
+def attach_departments(session: Session, flush_context) -> None:
+    new, moved = session.info.pop(DEPARTMENT_TREE_PENDING, ((), ()))
+    if new:
+        session.execute(
+            insert(DepartmentClosure.__table__),
+            [dict(ancestor_id=department.id, descendant_id=department.id, depth=0) for department in new],
+        )
+    for department in (*new, *moved):
+        if department.parent_id is not None:
+            session.execute(attach_subtree(department.id, department.parent_id))
+
+
+@event.listens_for(Session, 'before_flush')
+def detach_managers(session: Session, flush_context, instances) -> None:
+    new = [obj for obj in session.new if isinstance(obj, UserCompanyMembership)]
+    moved = []
+    for obj in session.dirty:
+        if not isinstance(obj, UserCompanyMembership):
+            continue
+        if has_changes(obj, 'company_id', 'user_id', 'company', 'user'):
+            state = inspect(obj)
+            for user_id in {obj.user_id, *state.attrs.user_id.history.deleted} - {None}:
+                for company_id in {obj.company_id, *state.attrs.company_id.history.deleted} - {None}:
+                    session.execute(detach_reports(user_id, company_id, inclusive=True))
+            new.append(obj)
+        elif has_changes(obj, 'manager_id', 'manager'):
+            session.execute(detach_reports(obj.user_id, obj.company_id))
+            moved.append(obj)
+    for obj in session.deleted:
+        if isinstance(obj, UserCompanyMembership):
+            session.execute(detach_reports(obj.user_id, obj.company_id, inclusive=True))
+        elif isinstance(obj, User):
+            session.execute(detach_reports(obj.id, inclusive=True))
+    if new or moved:
+        session.info[MANAGER_TREE_PENDING] = (new, moved)
+
+
+@event.listens_for(Session, 'after_flush')
+def attach_managers(session: Session, flush_context) -> None:
+    new, moved = session.info.pop(MANAGER_TREE_PENDING, ((), ()))
+    for membership in new:
+        session.execute(
+            insert(ManagerClosure.__table__).values(
+                company_id=membership.company_id,
+                ancestor_id=membership.user_id,
+                descendant_id=membership.user_id,
+                depth=0,
+            )
+        )
+        if membership.manager_id is not None:
+            session.execute(attach_to_manager(membership.user_id, membership.company_id, membership.manager_id))
+        session.execute(attach_direct_reports(membership.user_id, membership.company_id))
+    for membership in moved:
+        if membership.manager_id is not None:
+            session.execute(attach_to_manager(membership.user_id, membership.company_id, membership.manager_id))
+
+
+def membership_keys(db_obj: UserCompanyMembership) -> set[tuple[int, int]]:
+    state = inspect(db_obj)
+    ids = {}
+    for column, relation in (('user_id', 'user'), ('company_id', 'company')):
+        ids[column] = {getattr(db_obj, column), *state.attrs[column].history.deleted}
+        related = state.attrs[relation].loaded_value
+        if related is not NO_VALUE and related is not None:
+            ids[column].add(related.id)
+        ids[column].discard(None)
+    return {(user_id, company_id) for user_id in ids['user_id'] for company_id in ids['company_id']}
+
+
+@event.listens_for(Session, 'before_flush')
+def invalidate_memberships(session: Session, flush_context, instances) -> None:
+    keys = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, UserCompanyMembership) and (obj not in session.dirty or session.is_modified(obj)):
+            keys |= membership_keys(obj)
+    conditions = []
+    company_ids = [obj.id for obj in session.deleted if isinstance(obj, Company)]
+    user_ids = [obj.id for obj in session.deleted if isinstance(obj, User)]
+    if company_ids:
+        conditions.append(UserCompanyMembership.company_id.in_(company_ids))
+    if user_ids:
+        conditions.append(UserCompanyMembership.user_id.in_(user_ids))
+    if conditions:
+        result = session.execute(
+            select(UserCompanyMembership.user_id, UserCompanyMembership.company_id).where(or_(*conditions))
+        )
+        keys.update(result.tuples())
+    if keys:
+        cache = session.info.get(MEMBERSHIP_CACHE, {})
+        for key in keys:
+            cache.pop(key, None)
+        invalidator.publish(session, MEMBERSHIP_CACHE_CHANNEL, keys)
+
+
+@event.listens_for(Session, 'after_commit')
+@event.listens_for(Session, 'after_rollback')
+def clear_membership_cache(session: Session) -> None:
+    session.info.pop(MEMBERSHIP_CACHE, None)
 
 
 company_crud = CRUDCompany(Company)
@@ -80,3 +472,4 @@ department_crud = CRUDDepartment(Department)
 membership_crud = CRUDMembership(UserCompanyMembership)
 news_crud = CRUDNews(CompanyNews)
 invites_crud = CRUDInvites(Invite)
+invite_import_crud = CRUDInviteImports(InviteImport)
@@ -0,0 +1,34 @@
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.base import CRUDBase
+from app.models.job import JobRun, JobStatus
+
+
+class CRUDJobRun(CRUDBase):
+    async def start(self, job_id: str, session: AsyncSession) -> JobRun:
+        job_run = self.model(job_id=job_id)
+        session.add(job_run)
+        await session.commit()
+        return job_run
+
+    async def finish(
+        self, job_run: JobRun, status: JobStatus, duration: float, session: AsyncSession, error: str | None = None
+    ) -> JobRun:
+        job_run.status = status
+        job_run.finished_at = datetime.now()
+        job_run.duration = duration
+        job_run.error = error
+        await session.commit()
+        return job_run
+
+    async def get_recent(self, job_id: str | None, limit: int, session: AsyncSession) -> list[JobRun]:
+        query = select(self.model).order_by(self.model.started_at.desc(), self.model.id.desc()).limit(limit)
+        if job_id is not None:
+            query = query.where(self.model.job_id == job_id)
+        return (await session.scalars(query)).all()
+
+
+job_run_crud = CRUDJobRun(JobRun)
@@ -0,0 +1,62 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, insert, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.constants import MAIL_CLAIM_LEASE, MAIL_MAX_RETRY_DELAY
+from app.crud.base import CRUDBase
+from app.models.mail import MailOutbox
+
+
+class CRUDMailOutbox(CRUDBase):
+    async def create_multi(self, items: list, session: AsyncSession) -> None:
+        await session.execute(insert(self.model), [item.model_dump() for item in items])
+
+    async def claim(self, limit: int, session: AsyncSession) -> list[MailOutbox]:
+        now = datetime.now()
+        due = (
+            select(self.model.id)
+            .where(
+                self.model.sent_at.is_(None),
+                self.model.attempts < settings.mail_outbox_max_attempts,
+                self.model.next_attempt_at <= now,
+            )
+            .order_by(self.model.next_attempt_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await session.scalars(
+            update(self.model)
+            .where(self.model.id.in_(due.scalar_subquery()))
+            .values(next_attempt_at=now + timedelta(seconds=MAIL_CLAIM_LEASE))
+            .returning(self.model)
+        )
+        emails = result.all()
+        await session.commit()
+        return emails
+
+    async def mark_sent(self, ids: list[int], session: AsyncSession) -> None:
+        if ids:
+            await session.execute(
+                update(self.model)
+                .where(self.model.id.in_(ids))
+                .values(sent_at=datetime.now(), attempts=self.model.attempts + 1, last_error=None)
+            )
+        await session.commit()
+
+    async def mark_failed(self, errors: dict[int, str], session: AsyncSession) -> None:
+        delay = func.least(
+            literal(timedelta(seconds=settings.mail_outbox_retry_delay)) * func.power(2, self.model.attempts),
+            timedelta(seconds=MAIL_MAX_RETRY_DELAY),
+        )
+        for email_id, error in errors.items():
+            await session.execute(
+                update(self.model)
+                .where(self.model.id == email_id)
+                .values(attempts=self.model.attempts + 1, last_error=error, next_attempt_at=datetime.now() + delay)
+            )
+        await session.commit()
+
+
+mail_outbox_crud = CRUDMailOutbox(MailOutbox)
@@ -1,14 +1,23 @@
+from collections import defaultdict
 from datetime import datetime
 
-from sqlalchemy import select
+from sqlalchemy import Integer, cast, func, select, union_all
+from sqlalchemy.dialects.postgresql import ARRAY, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.constants import MEETING_SCHEDULE_LOCK
+from app.core.db import use_primary
 from app.crud.base import CRUDBase
 from app.models.meeting import Meeting, MeetingAttendee
+from app.models.task import Task
 from app.models.user import User
 from app.schemas.meeting import MeetingCreate
 
 
+def overlaps(start: datetime, end: datetime):
+    return func.tsrange(Meeting.start_at, Meeting.end_at).op('&&')(func.tsrange(start, end))
+
+
 class CRUDMeeting(CRUDBase):
     async def create(self, obj_in: MeetingCreate, user: User, company_id: int, session: AsyncSession):
         data = obj_in.model_dump()
@@ -17,12 +26,12 @@ class CRUDMeeting(CRUDBase):
         db_obj = self.model(**data)
         session.add(db_obj)
         await session.commit()
-        await session.refresh(db_obj)
         return db_obj
 
-    async def get_multi_by_company(self, company_id: int, session: AsyncSession):
-        result = await session.execute(select(self.model).where(self.model.company_id == company_id))
-        return result.scalars().all()
+    async def get_multi_by_company(
+        self, company_id: int, session: AsyncSession, limit: int | None = None, after: tuple | None = None
+    ):
+        return await self.get_page(session, self.model.company_id == company_id, limit=limit, after=after)
 
     async def get_user_meetings_at_the_same_time(
         self, user_id: int, start: datetime, end: datetime, session: AsyncSession, company_id: int | None = None
@@ -30,22 +39,72 @@ class CRUDMeeting(CRUDBase):
         query = (
             select(self.model)
             .join(MeetingAttendee, MeetingAttendee.meeting_id == self.model.id)
-            .where(self.model.start_at < end, self.model.end_at > start, MeetingAttendee.user_id == user_id)
+            .where(overlaps(start, end), MeetingAttendee.user_id == user_id)
         )
         if company_id is not None:
             query = query.where(self.model.company_id == company_id)
         result = await session.execute(query)
         return result.scalars().all()
 
+    async def get_users_meetings_at_the_same_time(
+        self, user_ids: list[int], start: datetime, end: datetime, session: AsyncSession, exclude_id: int | None = None
+    ) -> dict[int, list[Meeting]]:
+        query = (
+            select(MeetingAttendee.user_id, self.model)
+            .join(MeetingAttendee, MeetingAttendee.meeting_id == self.model.id)
+            .where(overlaps(start, end), MeetingAttendee.user_id.in_(user_ids))
+        )
+        if exclude_id is not None:
+            query = query.where(self.model.id != exclude_id)
+        meetings = defaultdict(list)
+        for user_id, meeting in await session.execute(query):
+            meetings[user_id].append(meeting)
+        return meetings
+
+    async def get_busy_periods(
+        self, user_ids: list[int], start: datetime, end: datetime, session: AsyncSession
+    ) -> list[tuple[datetime, datetime]]:
+        busy = union_all(
+            select(self.model.start_at, self.model.end_at)
+            .join(MeetingAttendee, MeetingAttendee.meeting_id == self.model.id)
+            .where(overlaps(start, end), MeetingAttendee.user_id.in_(user_ids)),
+            select(Task.start_at, Task.end_at).where(
+                Task.start_at < end, Task.end_at > start, Task.executor_id.in_(user_ids)
+            ),
+        ).subquery()
+        result = await session.execute(select(busy).order_by(busy.c.start_at))
+        return result.all()
+
 
 class CRUDMeetingAttendee(CRUDBase):
     async def create(self, meeting_id: int, user_id: int, session: AsyncSession):
         db_obj = self.model(meeting_id=meeting_id, user_id=user_id)
         session.add(db_obj)
         await session.commit()
-        await session.refresh(db_obj)
         return db_obj
 
+    async def create_multi(self, meeting_id: int, user_ids: list[int], session: AsyncSession) -> list[int]:
+        result = await session.execute(
+            insert(self.model)
+            .values([dict(meeting_id=meeting_id, user_id=user_id) for user_id in user_ids])
+            .on_conflict_do_nothing(constraint='unique_meeting_user')
+            .returning(self.model.user_id)
+        )
+        added = result.scalars().all()
+        await session.commit()
+        return added
+
+    async def lock_users_schedule(self, user_ids: list[int], session: AsyncSession) -> None:
+        users = func.unnest(cast(sorted(user_ids), ARRAY(Integer))).table_valued('user_id')
+        use_primary(session)
+        await session.execute(select(func.pg_advisory_xact_lock(MEETING_SCHEDULE_LOCK, users.c.user_id)))
+
+    async def get_user_ids_in_meeting(self, meeting_id: int, user_ids: list[int], session: AsyncSession) -> set[int]:
+        result = await session.execute(
+            select(self.model.user_id).where(self.model.meeting_id == meeting_id, self.model.user_id.in_(user_ids))
+        )
+        return set(result.scalars().all())
+
     async def get_users_from_meeting_attend(self, meeting_id: int, session: AsyncSession):
         result = await session.execute(
             select(User)
@@ -55,5 +114,5 @@ class CRUDMeetingAttendee(CRUDBase):
         return result.scalars().all()
 
 
-meeting_crud = CRUDMeeting(Meeting)
+meeting_crud = CRUDMeeting(Meeting, sort_keys=(Meeting.start_at,))
 attendee_crud = CRUDMeetingAttendee(MeetingAttendee)
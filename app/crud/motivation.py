@@ -1,12 +1,104 @@
-from sqlalchemy import and_, func, select
+from datetime import datetime
+
+from sqlalchemy import (
+    Float,
+    Integer,
+    String,
+    and_,
+    cast,
+    delete,
+    event,
+    func,
+    inspect,
+    literal_column,
+    or_,
+    select,
+    text,
+    true,
+    tuple_,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
-from app.crud.base import CRUDBase
+from app.core.constants import RATING_CRITERIA, RATING_PERCENTILES, RATING_SCORES
+from app.crud.base import CRUDBase, has_changes
+from app.crud.company import subtree_ids
 from app.models.company import UserCompanyMembership
-from app.models.motivation import Rating
+from app.models.motivation import Rating, RatingRollup
 from app.models.task import Task
 from app.schemas.motivation import RatingCreate
 
+ROLLUP_PENDING = 'rating_rollup_pending'
+
+
+def period_filters(column, year: int | None = None, quarter: int | None = None) -> list:
+    if year is None:
+        if quarter is None:
+            return []
+        year = datetime.now().year
+    first_month = 1 if quarter is None else 3 * quarter - 2
+    start = datetime(year, first_month, 1)
+    end = datetime(year + 1, 1, 1) if quarter in (None, 4) else datetime(year, first_month + 3, 1)
+    return [column >= start, column < end]
+
+
+def rollup_delta(sign: int, *filters):
+    year = cast(func.extract('year', Rating.created_at), Integer)
+    quarter = cast(func.extract('quarter', Rating.created_at), Integer)
+    source = (
+        select(
+            Task.company_id,
+            UserCompanyMembership.department_id,
+            Task.executor_id,
+            year,
+            quarter,
+            func.sum(Rating.avg) * sign,
+            func.count() * sign,
+        )
+        .select_from(Rating)
+        .join(Task, Task.id == Rating.task_id)
+        .join(
+            UserCompanyMembership,
+            and_(
+                UserCompanyMembership.user_id == Task.executor_id,
+                UserCompanyMembership.company_id == Task.company_id,
+            ),
+        )
+        .where(*filters)
+        .group_by(Task.company_id, UserCompanyMembership.department_id, Task.executor_id, year, quarter)
+    )
+    query = insert(RatingRollup).from_select(
+        ['company_id', 'department_id', 'user_id', 'year', 'quarter', 'total', 'count'], source
+    )
+    return query.on_conflict_do_update(
+        constraint='unique_rating_rollup',
+        set_={'total': RatingRollup.total + query.excluded.total, 'count': RatingRollup.count + query.excluded.count},
+    )
+
+
+def member_keys(membership: UserCompanyMembership) -> set[tuple[int, int]]:
+    state = inspect(membership)
+    ids = []
+    for column, relation in (('company_id', 'company'), ('user_id', 'user')):
+        history = state.attrs[relation].history
+        values = {getattr(membership, column), *state.attrs[column].history.deleted}
+        values |= {related.id for related in (*history.added, *history.deleted) if related is not None}
+        ids.append(values - {None})
+    return {(company_id, user_id) for company_id in ids[0] for user_id in ids[1]}
+
+
+def pending_filter(rating_ids: set[int], task_ids: set[int], members: set[tuple[int, int]]):
+    filters = []
+    if rating_ids:
+        filters.append(Rating.id.in_(sorted(rating_ids)))
+    if task_ids:
+        filters.append(Task.id.in_(sorted(task_ids)))
+    if members:
+        filters.append(tuple_(Task.company_id, Task.executor_id).in_(sorted(members)))
+    return or_(*filters)
+
 
 class CRUDRating(CRUDBase):
     async def create_for_task(self, task: Task, obj_in: RatingCreate, session: AsyncSession) -> Rating:
@@ -15,7 +107,6 @@ class CRUDRating(CRUDBase):
         db_obj = self.model(**data)
         session.add(db_obj)
         await session.commit()
-        await session.refresh(db_obj)
         return db_obj
 
     async def get_multi_by_user(
@@ -26,75 +117,185 @@ class CRUDRating(CRUDBase):
         quarter: int | None = None,
         company_id: int | None = None,
     ) -> list[Rating]:
-        query = select(self.model).join(Task, Task.id == self.model.task_id).where(Task.executor_id == user_id)
+        query = (
+            select(self.model)
+            .join(Task, Task.id == self.model.task_id)
+            .where(Task.executor_id == user_id, *period_filters(self.model.created_at, year, quarter))
+        )
         if company_id is not None:
             query = query.where(Task.company_id == company_id)
-        if year is not None:
-            query = query.where(func.extract('year', self.model.created_at) == year)
-        if quarter is not None:
-            query = query.where(func.extract('quarter', self.model.created_at) == quarter)
         query = query.order_by(self.model.created_at.desc())
         query = await session.execute(query)
         return query.scalars().all()
 
-    async def user_avg_in_company(
-        self,
-        membership: UserCompanyMembership,
-        session: AsyncSession,
-        year: int | None = None,
-        quarter: int | None = None,
-    ) -> float:
-        query = (
-            select(func.avg(self.model.avg))
+    async def histogram(self, company_id: int, year: int, quarter: int, session: AsyncSession) -> dict[str, list]:
+        scoped = (
+            select(*(getattr(self.model, criterion) for criterion in RATING_CRITERIA))
             .join(Task, Task.id == self.model.task_id)
-            .where(Task.executor_id == membership.user_id, Task.company_id == membership.company_id)
+            .where(Task.company_id == company_id, *period_filters(self.model.created_at, year, quarter))
+            .cte('scoped_ratings')
         )
-        if year is not None:
-            query = query.where(func.extract('year', self.model.created_at) == year)
-        if quarter is not None:
-            query = query.where(func.extract('quarter', self.model.created_at) == quarter)
-        result = await session.execute(query)
-        return result.scalar() or 0.0
-
-    async def user_department_avg_in_company(
-        self,
-        membership: UserCompanyMembership,
-        session: AsyncSession,
-        year: int | None = None,
-        quarter: int | None = None,
-    ) -> float:
-        query = (
-            select(func.avg(self.model.avg))
-            .join(Task, Task.id == self.model.task_id)
-            .join(
-                UserCompanyMembership,
-                and_(
-                    UserCompanyMembership.user_id == Task.executor_id,
-                    UserCompanyMembership.company_id == membership.company_id,
-                    UserCompanyMembership.department_id == membership.department_id,
-                ),
+        query = union_all(
+            *(
+                select(
+                    literal_column(f"'{criterion}'", String).label('criterion'),
+                    scoped.c[criterion].label('score'),
+                    func.count().label('count'),
+                ).group_by(scoped.c[criterion])
+                for criterion in RATING_CRITERIA
             )
-            .where(Task.company_id == membership.company_id)
         )
-        if year is not None:
-            query = query.where(func.extract('year', self.model.created_at) == year)
-        if quarter is not None:
-            query = query.where(func.extract('quarter', self.model.created_at) == quarter)
-        result = await session.execute(query)
-        return result.scalar() or 0.0
+        counts = {(row.criterion, row.score): row.count for row in await session.execute(query)}
+        return {
+            criterion: [dict(score=score, count=counts.get((criterion, score), 0)) for score in RATING_SCORES]
+            for criterion in RATING_CRITERIA
+        }
 
     async def summary(
         self,
         membership: UserCompanyMembership,
         session: AsyncSession,
-        year: int | None = None,
-        quarter: int | None = None,
+        year: int,
+        quarter: int,
     ) -> tuple[list[Rating], float, float]:
+        totals = (
+            select(
+                (
+                    func.sum(RatingRollup.total).filter(RatingRollup.user_id == membership.user_id)
+                    / func.nullif(func.sum(RatingRollup.count).filter(RatingRollup.user_id == membership.user_id), 0)
+                ).label('user_avg'),
+                (func.sum(RatingRollup.total) / func.nullif(func.sum(RatingRollup.count), 0)).label('department_avg'),
+            )
+            .where(
+                RatingRollup.company_id == membership.company_id,
+                RatingRollup.department_id == membership.department_id,
+                RatingRollup.year == year,
+                RatingRollup.quarter == quarter,
+            )
+            .cte('totals')
+        )
+        ratings = (
+            select(self.model.id)
+            .join(Task, Task.id == self.model.task_id)
+            .where(
+                Task.company_id == membership.company_id,
+                Task.executor_id == membership.user_id,
+                *period_filters(self.model.created_at, year, quarter),
+            )
+            .cte('user_ratings')
+        )
+        query = (
+            select(totals.c.user_avg, totals.c.department_avg, self.model)
+            .select_from(totals)
+            .outerjoin(ratings, true())
+            .outerjoin(self.model, self.model.id == ratings.c.id)
+            .order_by(self.model.created_at.desc())
+        )
+        rows = (await session.execute(query)).all()
+        return (
+            [rating for *_, rating in rows if rating is not None],
+            rows[0].user_avg or 0.0,
+            rows[0].department_avg or 0.0,
+        )
+
+
+class CRUDRatingRollup(CRUDBase):
+    def ranking_query(self, company_id: int, year: int, quarter: int, *group_by):
+        avg = (func.sum(self.model.total) / func.sum(self.model.count)).label('avg')
         return (
-            await self.get_multi_by_user(membership.user_id, session, year, quarter, membership.company_id),
-            await self.user_avg_in_company(membership, session, year, quarter),
-            await self.user_department_avg_in_company(membership, session, year, quarter),
+            select(
+                *group_by,
+                avg,
+                func.sum(self.model.count).label('count'),
+                func.rank().over(order_by=avg.desc()).label('rank'),
+            )
+            .where(self.model.company_id == company_id, self.model.year == year, self.model.quarter == quarter)
+            .group_by(*group_by)
+            .having(func.sum(self.model.count) > 0)
+        )
+
+    async def subtree_summary(self, department_id: int, session: AsyncSession, year: int, quarter: int) -> dict:
+        query = select(
+            (func.sum(self.model.total) / func.nullif(func.sum(self.model.count), 0)).label('avg'),
+            func.sum(self.model.count).label('count'),
+        ).where(
+            self.model.department_id.in_(subtree_ids(department_id)),
+            self.model.year == year,
+            self.model.quarter == quarter,
+        )
+        row = (await session.execute(query)).one()
+        return dict(department_id=department_id, avg=row.avg or 0.0, count=row.count or 0)
+
+    async def leaderboard(self, company_id: int, year: int, quarter: int, limit: int, session: AsyncSession) -> dict:
+        users = self.ranking_query(company_id, year, quarter, self.model.user_id, self.model.department_id)
+        departments = self.ranking_query(company_id, year, quarter, self.model.department_id)
+        user_avgs = users.subquery()
+        percentiles = select(
+            func.percentile_cont(cast([percent / 100 for percent in RATING_PERCENTILES], ARRAY(Float)))
+            .within_group(user_avgs.c.avg)
+            .label('values')
+        )
+        values = (await session.execute(percentiles)).scalar_one() or []
+        return dict(
+            users=(await session.execute(users.order_by(text('rank')).limit(limit))).mappings().all(),
+            departments=(await session.execute(departments.order_by(text('rank')).limit(limit))).mappings().all(),
+            percentiles={f'p{percent}': value for percent, value in zip(RATING_PERCENTILES, values)},
+        )
+
+    async def rebuild(self, session: AsyncSession, company_id: int | None = None) -> None:
+        query = delete(self.model)
+        filters = []
+        if company_id is not None:
+            query = query.where(self.model.company_id == company_id)
+            filters.append(Task.company_id == company_id)
+        await session.execute(query)
+        await session.execute(rollup_delta(1, *filters))
+        await session.commit()
+
+
+@event.listens_for(Session, 'before_flush')
+def retract_rating_rollups(session: Session, flush_context, instances) -> None:
+    rating_ids, task_ids, members, new_ratings = set(), set(), set(), []
+    for obj in session.new:
+        if isinstance(obj, Rating):
+            new_ratings.append(obj)
+        elif isinstance(obj, UserCompanyMembership):
+            members |= member_keys(obj)
+    for obj in session.dirty:
+        if isinstance(obj, Rating) and session.is_modified(obj):
+            rating_ids.add(obj.id)
+        elif isinstance(obj, Task) and has_changes(obj, 'company_id', 'executor_id', 'company', 'executor'):
+            task_ids.add(obj.id)
+        elif isinstance(obj, UserCompanyMembership) and has_changes(
+            obj, 'company_id', 'user_id', 'department_id', 'company', 'user', 'department'
+        ):
+            members |= member_keys(obj)
+    for obj in session.deleted:
+        if isinstance(obj, Rating):
+            rating_ids.add(obj.id)
+        elif isinstance(obj, Task):
+            task_ids.add(obj.id)
+        elif isinstance(obj, UserCompanyMembership):
+            members |= member_keys(obj)
+    if rating_ids or task_ids:
+        session.execute(rollup_delta(-1, pending_filter(rating_ids, task_ids, set())))
+    if members:
+        session.execute(
+            delete(RatingRollup).where(tuple_(RatingRollup.company_id, RatingRollup.user_id).in_(sorted(members)))
         )
+    if rating_ids or task_ids or members or new_ratings:
+        session.info[ROLLUP_PENDING] = (rating_ids, task_ids, members, new_ratings)
+
+
+@event.listens_for(Session, 'after_flush')
+def apply_rating_rollups(session: Session, flush_context) -> None:
+    pending = session.info.pop(ROLLUP_PENDING, None)
+    if pending is None:
+        return
+    rating_ids, task_ids, members, new_ratings = pending
+    rating_ids |= {rating.id for rating in new_ratings}
+    session.execute(rollup_delta(1, pending_filter(rating_ids, task_ids, members)))
 
 
 rating_crud = CRUDRating(Rating)
+rating_rollup_crud = CRUDRatingRollup(RatingRollup)
@@ -1,9 +1,11 @@
-from sqlalchemy import select
+from sqlalchemy import DateTime, Integer, String, Text, cast, func, insert, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.crud.base import CRUDBase
-from app.models.task import Task, TaskComment
+from app.models.task import Task, TaskComment, TaskStatus
 from app.models.user import User
+from app.schemas.task import TaskBatchUpdateItem, TaskCreate
 
 
 class CRUDTask(CRUDBase):
@@ -14,12 +16,60 @@ class CRUDTask(CRUDBase):
         db_obj = Task(**data)
         session.add(db_obj)
         await session.commit()
-        await session.refresh(db_obj)
         return db_obj
 
-    async def get_multi_by_company(self, company_id: int, session: AsyncSession):
-        result = await session.execute(select(self.model).where(self.model.company_id == company_id))
-        return result.scalars().all()
+    async def get_multi_by_company(
+        self, company_id: int, session: AsyncSession, limit: int | None = None, after: tuple | None = None
+    ):
+        return await self.get_page(session, self.model.company_id == company_id, limit=limit, after=after)
+
+    async def create_multi(self, items: list[TaskCreate], company_id: int, session: AsyncSession, author: User):
+        rows = [dict(item.model_dump(), company_id=company_id, author_id=author.id) for item in items]
+        db_objs = (await session.scalars(insert(self.model).returning(self.model), rows)).all()
+        await session.commit()
+        return db_objs
+
+    async def get_multi_by_ids(self, task_ids: list[int], company_id: int, session: AsyncSession) -> dict[int, Task]:
+        result = await session.execute(
+            select(self.model).where(self.model.id.in_(task_ids), self.model.company_id == company_id)
+        )
+        return {task.id: task for task in result.scalars()}
+
+    async def update_multi(self, items: list[TaskBatchUpdateItem], session: AsyncSession):
+        columns = {
+            'id': Integer,
+            'title': String,
+            'body': Text,
+            'status': String,
+            'start_at': DateTime,
+            'end_at': DateTime,
+        }
+        data = {name: [] for name in columns}
+        for item in items:
+            for name in columns:
+                value = getattr(item, name)
+                data[name].append(value.name if isinstance(value, TaskStatus) else value)
+        batch = (
+            func.unnest(*(cast(data[name], ARRAY(type_)) for name, type_ in columns.items()))
+            .table_valued(*columns)
+            .render_derived(name='batch')
+        )
+        query = (
+            update(self.model)
+            .where(self.model.id == batch.c.id)
+            .values(
+                title=func.coalesce(batch.c.title, self.model.title),
+                body=func.coalesce(batch.c.body, self.model.body),
+                status=func.coalesce(cast(batch.c.status, self.model.status.type), self.model.status),
+                start_at=func.coalesce(batch.c.start_at, self.model.start_at),
+                end_at=func.coalesce(batch.c.end_at, self.model.end_at),
+            )
+            .returning(self.model)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        db_objs = (await session.scalars(query)).all()
+        await session.commit()
+        return db_objs
 
     async def get_by_company(self, task_id: int, company_id: int, session: AsyncSession):
         result = await session.execute(
@@ -36,12 +86,12 @@ class CRUDCommentTask(CRUDBase):
         db_obj = TaskComment(**data)
         session.add(db_obj)
         await session.commit()
-        await session.refresh(db_obj)
         return db_obj
 
-    async def get_multi_by_task(self, task_id: int, session: AsyncSession):
-        result = await session.execute(select(self.model).where(self.model.task_id == task_id))
-        return result.scalars().all()
+    async def get_multi_by_task(
+        self, task_id: int, session: AsyncSession, limit: int | None = None, after: tuple | None = None
+    ):
+        return await self.get_page(session, self.model.task_id == task_id, limit=limit, after=after)
 
     async def get_by_task(self, comment_id: int, task_id: int, session: AsyncSession):
         result = await session.execute(
@@ -4,18 +4,28 @@ from fastapi import FastAPI
 
 from app.admin.config import init_admin
 from app.api.routers import main_router
+from app.core.cache import invalidator
 from app.core.config import settings
+from app.core.db import warm_up_pool
 from app.core.init_db import init_db
-from app.core.scheduler import register_jobs, start_scheduler, stop_scheduler
+from app.core.password import password_hasher
+from app.core.scheduler import register_jobs, scheduler_leader, start_scheduler, stop_scheduler
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await init_db()
+    if settings.db_pool_warm_up:
+        await warm_up_pool()
+    await invalidator.start()
     start_scheduler()
     register_jobs()
+    await scheduler_leader.start()
     yield
+    await scheduler_leader.stop()
     stop_scheduler()
+    await invalidator.stop()
+    password_hasher.shutdown()
 
 
 app = FastAPI(title=settings.app_title, description=settings.description, lifespan=lifespan)
@@ -2,7 +2,8 @@ from datetime import datetime
 from enum import StrEnum
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, Enum, ForeignKey, String, UniqueConstraint
+from sqlalchemy import DateTime, Enum, ForeignKey, Index, Integer, String, UniqueConstraint, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.constants import (
@@ -26,6 +27,13 @@ class UserRole(StrEnum):
     ADMIN = 'admin'
 
 
+class ImportStatus(StrEnum):
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+
+
 class Company(Base):
     name: Mapped[str] = mapped_column(String(COMPANY_NAME_MAX_LENGTH), unique=True)
 
@@ -45,7 +53,10 @@ class Department(Base):
     company_id: Mapped[int] = mapped_column(ForeignKey('company.id', ondelete='CASCADE'))
     parent_id: Mapped[int | None] = mapped_column(ForeignKey('department.id', ondelete='SET NULL'))
 
-    __table_args__ = (UniqueConstraint('name', 'company_id', name='unique_department_company'),)
+    __table_args__ = (
+        UniqueConstraint('name', 'company_id', name='unique_department_company'),
+        Index('ix_department_company_id', 'company_id', 'id'),
+    )
 
     company: Mapped['Company'] = relationship(back_populates='departments')
     memberships: Mapped[list['UserCompanyMembership']] = relationship(back_populates='department')
@@ -57,6 +68,29 @@ class Department(Base):
         return self.name
 
 
+class DepartmentClosure(Base):
+    ancestor_id: Mapped[int] = mapped_column(ForeignKey('department.id', ondelete='CASCADE'))
+    descendant_id: Mapped[int] = mapped_column(ForeignKey('department.id', ondelete='CASCADE'))
+    depth: Mapped[int] = mapped_column(Integer)
+
+    __table_args__ = (
+        UniqueConstraint('ancestor_id', 'descendant_id', name='unique_department_closure'),
+        Index('ix_departmentclosure_descendant_id', 'descendant_id', 'depth'),
+    )
+
+
+class ManagerClosure(Base):
+    company_id: Mapped[int] = mapped_column(ForeignKey('company.id', ondelete='CASCADE'))
+    ancestor_id: Mapped[int] = mapped_column(ForeignKey('user.id', ondelete='CASCADE'))
+    descendant_id: Mapped[int] = mapped_column(ForeignKey('user.id', ondelete='CASCADE'))
+    depth: Mapped[int] = mapped_column(Integer)
+
+    __table_args__ = (
+        UniqueConstraint('company_id', 'ancestor_id', 'descendant_id', name='unique_manager_closure'),
+        Index('ix_managerclosure_descendant_id', 'company_id', 'descendant_id', 'depth'),
+    )
+
+
 class UserCompanyMembership(Base):
     user_id: Mapped[int] = mapped_column(ForeignKey('user.id', ondelete='CASCADE'))
     company_id: Mapped[int] = mapped_column(ForeignKey('company.id', ondelete='CASCADE'))
@@ -64,7 +98,11 @@ class UserCompanyMembership(Base):
     manager_id: Mapped[int | None] = mapped_column(ForeignKey('user.id', ondelete='SET NULL'))
     role: Mapped[UserRole] = mapped_column(Enum(UserRole), default=UserRole.USER)
 
-    __table_args__ = (UniqueConstraint('user_id', 'company_id', name='unique_user_company'),)
+    __table_args__ = (
+        UniqueConstraint('user_id', 'company_id', name='unique_user_company'),
+        Index('ix_usercompanymembership_company_id', 'company_id', 'id'),
+        Index('ix_usercompanymembership_department_id', 'department_id', 'id'),
+    )
 
     user: Mapped['User'] = relationship(back_populates='memberships', foreign_keys=[user_id])
     company: Mapped['Company'] = relationship(back_populates='memberships', foreign_keys=[company_id])
@@ -82,6 +120,8 @@ class CompanyNews(Base):
     company_id: Mapped[int] = mapped_column(ForeignKey('company.id', ondelete='CASCADE'))
     published_at: Mapped[datetime] = mapped_column(DateTime)
 
+    __table_args__ = (Index('ix_companynews_company_id', 'company_id', 'id'),)
+
     author: Mapped['User'] = relationship(back_populates='news_posts')
     company: Mapped['Company'] = relationship(back_populates='news')
 
@@ -104,3 +144,25 @@ class Invite(Base):
 
     def __admin_repr__(self, request):
         return f'{self.email} ({self.role})'
+
+
+class InviteImport(Base):
+    company_id: Mapped[int] = mapped_column(ForeignKey('company.id', ondelete='CASCADE'), index=True)
+    author_id: Mapped[int | None] = mapped_column(ForeignKey('user.id', ondelete='SET NULL'))
+    status: Mapped[ImportStatus] = mapped_column(Enum(ImportStatus), default=ImportStatus.PENDING)
+    total: Mapped[int] = mapped_column(Integer)
+    processed: Mapped[int] = mapped_column(Integer, default=0)
+    created: Mapped[int] = mapped_column(Integer, default=0)
+    errors: Mapped[list[dict]] = mapped_column(JSONB, default=list)
+    items: Mapped[list[dict]] = mapped_column(JSONB, default=list)
+    position: Mapped[int] = mapped_column(Integer, default=0)
+    lease_until: Mapped[datetime | None] = mapped_column(DateTime)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime)
+
+    __table_args__ = (
+        Index('ix_inviteimport_pending', 'created_at', postgresql_where=text("status IN ('PENDING', 'RUNNING')")),
+    )
+
+    def __admin_repr__(self, request):
+        return f'Импорт приглашений id={self.id} ({self.status})'
@@ -0,0 +1,28 @@
+from datetime import datetime
+from enum import StrEnum
+
+from sqlalchemy import DateTime, Enum, Float, Index, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.constants import JOB_ID_MAX_LENGTH
+from app.core.db import Base
+
+
+class JobStatus(StrEnum):
+    RUNNING = 'running'
+    SUCCESS = 'success'
+    FAILED = 'failed'
+
+
+class JobRun(Base):
+    job_id: Mapped[str] = mapped_column(String(JOB_ID_MAX_LENGTH))
+    status: Mapped[JobStatus] = mapped_column(Enum(JobStatus), default=JobStatus.RUNNING)
+    started_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime)
+    duration: Mapped[float | None] = mapped_column(Float)
+    error: Mapped[str | None] = mapped_column(Text)
+
+    __table_args__ = (Index('ix_jobrun_job_id_started_at', 'job_id', 'started_at'),)
+
+    def __admin_repr__(self, request):
+        return f'{self.job_id} ({self.started_at}, {self.status})'
@@ -0,0 +1,23 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Index, Integer, String, Text, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.constants import MAIL_SUBJECT_MAX_LENGTH
+from app.core.db import Base
+
+
+class MailOutbox(Base):
+    recipient: Mapped[str] = mapped_column(String(length=320))
+    subject: Mapped[str] = mapped_column(String(MAIL_SUBJECT_MAX_LENGTH))
+    body: Mapped[str] = mapped_column(Text)
+    attempts: Mapped[int] = mapped_column(Integer, default=0, server_default='0')
+    last_error: Mapped[str | None] = mapped_column(Text)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
+    sent_at: Mapped[datetime | None] = mapped_column(DateTime)
+
+    __table_args__ = (Index('ix_mailoutbox_pending', 'next_attempt_at', postgresql_where=text('sent_at IS NULL')),)
+
+    def __admin_repr__(self, request):
+        return f'{self.subject[:30]}... ({self.recipient})'
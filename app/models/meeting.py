@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import CheckConstraint, DateTime, ForeignKey, String, UniqueConstraint
+from sqlalchemy import CheckConstraint, DateTime, ForeignKey, Index, String, UniqueConstraint, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.constants import MEETING_DESC_MAX_LENGTH, MEETING_TITLE_MAX_LENGTH
@@ -20,7 +20,11 @@ class Meeting(Base):
     start_at: Mapped[datetime] = mapped_column(DateTime)
     end_at: Mapped[datetime] = mapped_column(DateTime)
 
-    __table_args__ = (CheckConstraint('end_at > start_at', name='meeting_time_valid'),)
+    __table_args__ = (
+        CheckConstraint('end_at > start_at', name='meeting_time_valid'),
+        Index('ix_meeting_company_period', 'company_id', 'start_at', 'end_at'),
+        Index('ix_meeting_period', text('tsrange(start_at, end_at)'), postgresql_using='gist'),
+    )
 
     company: Mapped['Company'] = relationship(back_populates='meetings')
     author: Mapped['User'] = relationship(back_populates='meetings_authored')
@@ -35,7 +39,7 @@ class Meeting(Base):
 
 class MeetingAttendee(Base):
     meeting_id: Mapped[int] = mapped_column(ForeignKey('meeting.id', ondelete='CASCADE'))
-    user_id: Mapped[int] = mapped_column(ForeignKey('user.id', ondelete='CASCADE'))
+    user_id: Mapped[int] = mapped_column(ForeignKey('user.id', ondelete='CASCADE'), index=True)
 
     __table_args__ = (UniqueConstraint('meeting_id', 'user_id', name='unique_meeting_user'),)
 
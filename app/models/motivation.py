@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import CheckConstraint, Computed, DateTime, Float, ForeignKey, SmallInteger
+from sqlalchemy import CheckConstraint, Computed, DateTime, Float, ForeignKey, Integer, SmallInteger, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.db import Base
@@ -18,7 +18,7 @@ class Rating(Base):
     avg: Mapped[float] = mapped_column(
         Float, Computed('ROUND((timeliness + completeness + quality) / 3.0, 2)', persisted=True)
     )
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now, index=True)
 
     __table_args__ = (
         CheckConstraint('timeliness BETWEEN 1 AND 5', name='timeliness_1-5'),
@@ -30,3 +30,25 @@ class Rating(Base):
 
     def __admin_repr__(self, request):
         return f'task_id={self.task_id} - avg={self.avg}'
+
+
+class RatingRollup(Base):
+    company_id: Mapped[int] = mapped_column(ForeignKey('company.id', ondelete='CASCADE'))
+    department_id: Mapped[int | None] = mapped_column(ForeignKey('department.id', ondelete='SET NULL'))
+    user_id: Mapped[int] = mapped_column(ForeignKey('user.id', ondelete='CASCADE'))
+    year: Mapped[int] = mapped_column(SmallInteger)
+    quarter: Mapped[int] = mapped_column(SmallInteger)
+    total: Mapped[float] = mapped_column(Float, default=0, server_default='0')
+    count: Mapped[int] = mapped_column(Integer, default=0, server_default='0')
+
+    __table_args__ = (
+        UniqueConstraint(
+            'company_id',
+            'department_id',
+            'user_id',
+            'year',
+            'quarter',
+            name='unique_rating_rollup',
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
@@ -2,7 +2,7 @@ from datetime import datetime
 from enum import StrEnum
 from typing import TYPE_CHECKING
 
-from sqlalchemy import CheckConstraint, DateTime, Enum, ForeignKey, String, Text
+from sqlalchemy import CheckConstraint, DateTime, Enum, ForeignKey, Index, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.db import Base
@@ -29,7 +29,11 @@ class Task(Base):
     start_at: Mapped[datetime] = mapped_column(DateTime)
     end_at: Mapped[datetime] = mapped_column(DateTime)
 
-    __table_args__ = (CheckConstraint('end_at > start_at', name='task_time_valid'),)
+    __table_args__ = (
+        CheckConstraint('end_at > start_at', name='task_time_valid'),
+        Index('ix_task_company_executor_period', 'company_id', 'executor_id', 'start_at', 'end_at'),
+        Index('ix_task_company_id', 'company_id', 'id'),
+    )
 
     company: Mapped['Company'] = relationship(back_populates='tasks')
     author: Mapped['User'] = relationship(back_populates='tasks_authored', foreign_keys=[author_id])
@@ -46,6 +50,8 @@ class TaskComment(Base):
     author_id: Mapped[int] = mapped_column(ForeignKey('user.id', ondelete='CASCADE'))
     task_id: Mapped[int] = mapped_column(ForeignKey('task.id', ondelete='CASCADE'))
 
+    __table_args__ = (Index('ix_taskcomment_task_id', 'task_id', 'id'),)
+
     author: Mapped['User'] = relationship(back_populates='task_comments')
     task: Mapped['Task'] = relationship(back_populates='comments')
 
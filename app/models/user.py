@@ -1,7 +1,8 @@
 from typing import TYPE_CHECKING
 
 from fastapi_users_db_sqlalchemy import SQLAlchemyBaseUserTable
-from sqlalchemy.orm import Mapped, relationship
+from sqlalchemy import Integer
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.db import Base
 
@@ -12,6 +13,8 @@ if TYPE_CHECKING:
 
 
 class User(SQLAlchemyBaseUserTable[int], Base):
+    token_version: Mapped[int] = mapped_column(Integer, default=0, server_default='0')
+
     memberships: Mapped[list['UserCompanyMembership']] = relationship(
         back_populates='user', foreign_keys='UserCompanyMembership.user_id'
     )
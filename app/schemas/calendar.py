@@ -1,3 +1,4 @@
+from datetime import datetime
 from enum import StrEnum
 
 from pydantic import BaseModel
@@ -13,8 +14,17 @@ class CalendarScope(StrEnum):
     YEAR = 'year'
 
 
-class CalendarRead(BaseModel):
-    scope: CalendarScope
+class CalendarEvents(BaseModel):
     news: list[CompanyNewsRead]
     tasks: list[TaskRead]
     meetings: list[MeetingRead]
+
+
+class CalendarRead(CalendarEvents):
+    scope: CalendarScope
+
+
+class CalendarPage(CalendarEvents):
+    date_from: datetime
+    date_to: datetime
+    next_cursor: str | None = None
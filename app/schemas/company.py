@@ -8,7 +8,7 @@ from app.core.constants import (
     NEWS_BODY_MAX_LENGTH,
     NEWS_TITLE_MAX_LENGTH,
 )
-from app.models.company import UserRole
+from app.models.company import ImportStatus, UserRole
 
 FIELD_CANT_BE_EMPTY = 'Поле не может быть пустым!'
 DATE_CANT_BE_IN_PAST = 'Нельзя опубликовать новость в прошлом'
@@ -57,6 +57,15 @@ class DepartmentUpdate(BaseModel):
         return value
 
 
+class DepartmentNode(BaseModel):
+    id: int
+    name: str
+    parent_id: int | None = None
+    members_count: int
+    subtree_members_count: int
+    children: list['DepartmentNode'] = []
+
+
 class CompanyMembershipBase(BaseModel):
     company_id: int
     department_id: int | None = None
@@ -159,3 +168,22 @@ class InviteRead(InviteBase):
     code: str
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class InviteImportError(BaseModel):
+    row: int
+    reason: str
+
+
+class InviteImportRead(BaseModel):
+    id: int
+    company_id: int
+    status: ImportStatus
+    total: int
+    processed: int
+    created: int
+    errors: list[InviteImportError]
+    created_at: datetime
+    finished_at: datetime | None = None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,17 @@
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict
+
+from app.models.job import JobStatus
+
+
+class JobRunRead(BaseModel):
+    id: int
+    job_id: str
+    status: JobStatus
+    started_at: datetime
+    finished_at: datetime | None = None
+    duration: float | None = None
+    error: str | None = None
+
+    model_config = ConfigDict(from_attributes=True)
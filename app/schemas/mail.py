@@ -0,0 +1,9 @@
+from pydantic import BaseModel, EmailStr, Field
+
+from app.core.constants import MAIL_SUBJECT_MAX_LENGTH
+
+
+class MailCreate(BaseModel):
+    recipient: EmailStr
+    subject: str = Field(..., max_length=MAIL_SUBJECT_MAX_LENGTH)
+    body: str
@@ -1,11 +1,17 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 
-from app.core.constants import MEETING_DESC_MAX_LENGTH, MEETING_TITLE_MAX_LENGTH
+from app.core.constants import (
+    MAX_FREE_SLOTS,
+    MAX_MEETING_INVITES,
+    MEETING_DESC_MAX_LENGTH,
+    MEETING_TITLE_MAX_LENGTH,
+)
 from app.schemas.user import UserShortRead
 
-INVALID_DATES = 'Дата окончания не может быть раньше даты начала!'
+INVALID_DATES = 'Дата окончания должна быть позже даты начала!'
+DURATION_EXCEEDS_PERIOD = 'Длительность встречи больше периода поиска!'
 FIELD_CANT_BE_EMPTY = 'Поле не может быть пустым!'
 
 
@@ -19,7 +25,7 @@ class MeetingBase(BaseModel):
 class MeetingCreate(MeetingBase):
     @model_validator(mode='after')
     def check_dates(cls, values):
-        if values.end_at < values.start_at:
+        if values.end_at <= values.start_at:
             raise ValueError(INVALID_DATES)
         return values
 
@@ -56,3 +62,47 @@ class MeetingAttendeeAdminCreate(BaseModel):
 
 class MeetingAttendeeRead(MeetingRead):
     invited: list[UserShortRead]
+
+
+class MeetingInvite(BaseModel):
+    user_ids: list[int] = Field(..., min_length=1, max_length=MAX_MEETING_INVITES)
+
+    @field_validator('user_ids')
+    def unique_ids(cls, value):
+        return list(dict.fromkeys(value))
+
+
+class MeetingInviteRejected(BaseModel):
+    user_id: int
+    reason: str
+
+
+class MeetingInviteResult(BaseModel):
+    meeting_id: int
+    added: list[int]
+    rejected: list[MeetingInviteRejected]
+
+
+class FreeSlotsSearch(BaseModel):
+    user_ids: list[int] = Field(..., min_length=1, max_length=MAX_MEETING_INVITES)
+    start_at: datetime
+    end_at: datetime
+    duration: timedelta = Field(..., gt=timedelta(0))
+    limit: int = Field(MAX_FREE_SLOTS, ge=1, le=MAX_FREE_SLOTS)
+
+    @field_validator('user_ids')
+    def unique_ids(cls, value):
+        return list(dict.fromkeys(value))
+
+    @model_validator(mode='after')
+    def check_dates(cls, values):
+        if values.end_at <= values.start_at:
+            raise ValueError(INVALID_DATES)
+        if values.end_at - values.start_at < values.duration:
+            raise ValueError(DURATION_EXCEEDS_PERIOD)
+        return values
+
+
+class FreeSlot(BaseModel):
+    start_at: datetime
+    end_at: datetime
@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+
+
+class PoolMetricsRead(BaseModel):
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    max_overflow: int
+    checkouts: int
+    timeouts: int
+    wait_total: float
+    wait_avg: float
+    wait_max: float
@@ -29,3 +29,44 @@ class RatingsSummary(BaseModel):
     department_avg: float
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class RatingPlace(BaseModel):
+    rank: int
+    avg: float
+    count: int
+
+
+class UserRatingPlace(RatingPlace):
+    user_id: int
+    department_id: int | None = None
+
+
+class DepartmentRatingPlace(RatingPlace):
+    department_id: int | None = None
+
+
+class RatingScoreCount(BaseModel):
+    score: int
+    count: int
+
+
+class RatingHistogram(BaseModel):
+    timeliness: list[RatingScoreCount]
+    completeness: list[RatingScoreCount]
+    quality: list[RatingScoreCount]
+
+
+class RatingsLeaderboard(BaseModel):
+    year: int
+    quarter: int
+    users: list[UserRatingPlace]
+    departments: list[DepartmentRatingPlace]
+    percentiles: dict[str, float]
+    histogram: RatingHistogram
+
+
+class DepartmentRatingsSummary(BaseModel):
+    department_id: int
+    avg: float
+    count: int
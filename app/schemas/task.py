@@ -1,11 +1,12 @@
 from datetime import datetime
 
-from pydantic import BaseModel, ConfigDict, field_validator, model_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 
+from app.core.constants import MAX_TASK_BATCH
 from app.models.task import TaskStatus
 
 FIELD_CANT_BE_EMPTY = 'Поле не может быть пустым!'
-INVALID_DATES = 'Дата завершения не может быть раньше даты начала!'
+INVALID_DATES = 'Дата завершения должна быть позже даты начала!'
 BOTH_OR_NONE_DATES = 'Необходимо указать обе даты, либо не указывать ни одной!'
 
 
@@ -22,7 +23,7 @@ class TaskCreate(TaskBase):
 
     @model_validator(mode='after')
     def check_dates(cls, values):
-        if values.end_at < values.start_at:
+        if values.end_at <= values.start_at:
             raise ValueError(INVALID_DATES)
         return values
 
@@ -54,11 +55,33 @@ class TaskUpdate(BaseModel):
     def check_dates(cls, values):
         if (values.start_at is None) != (values.end_at is None):
             raise ValueError(BOTH_OR_NONE_DATES)
-        if values.start_at and values.end_at and values.end_at < values.start_at:
+        if values.start_at and values.end_at and values.end_at <= values.start_at:
             raise ValueError(INVALID_DATES)
         return values
 
 
+class TaskBatchUpdateItem(TaskUpdate):
+    id: int
+
+
+class TaskBatchCreate(BaseModel):
+    items: list[TaskCreate] = Field(..., min_length=1, max_length=MAX_TASK_BATCH)
+
+
+class TaskBatchUpdate(BaseModel):
+    items: list[TaskBatchUpdateItem] = Field(..., min_length=1, max_length=MAX_TASK_BATCH)
+
+
+class TaskBatchError(BaseModel):
+    index: int
+    reason: str
+
+
+class TaskBatchResult(BaseModel):
+    items: list[TaskRead]
+    errors: list[TaskBatchError]
+
+
 class TaskCommentCreate(BaseModel):
     body: str
 
@@ -1,14 +1,33 @@
+import asyncio
+import csv
+from datetime import datetime, timedelta
 from http import HTTPStatus
-from random import choices
+from io import TextIOWrapper
+from pathlib import Path
+from secrets import choice
+from typing import BinaryIO
 
 from fastapi import HTTPException
-from fastapi_mail import MessageSchema
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.base import Base  # noqa
 from app.core.config import settings
-from app.core.constants import INVITE_CODE_CHARS, INVITE_CODE_LENGTH, MAX_INVITE_CODE_ATTEMPTS
-from app.core.mail import mail
-from app.crud.company import invites_crud
+from app.core.constants import (
+    INVITE_CODE_CHARS,
+    INVITE_CODE_LENGTH,
+    INVITE_IMPORT_CHUNK,
+    INVITE_IMPORT_LEASE,
+    INVITE_IMPORT_POLL_INTERVAL,
+    MAX_INVITE_CODE_ATTEMPTS,
+    MAX_INVITE_IMPORT_ROWS,
+)
+from app.core.db import AsyncSessionLocal
+from app.crud.company import invite_import_crud, invites_crud
+from app.crud.mail import mail_outbox_crud
+from app.models.company import ImportStatus, Invite, InviteImport
+from app.schemas.company import InviteCreate
+from app.schemas.mail import MailCreate
 
 INVITE_LINK_TEMPLATE = f'{settings.app_host}/api/v1/companies/invites/accept?code={{code}}'
 SUBJECT = f'Приглашение в {settings.app_title}'
@@ -19,22 +38,122 @@ BODY_TEMPLATE = f"""
 <a href="{{invite_link}}">Присоединиться</a>
 """
 CODE_GENERATION_FAILED = 'Не удалось сгенерировать код приглашения!'
+UNSUPPORTED_IMPORT_FORMAT = 'Поддерживаются только файлы {}!'
+TOO_MANY_IMPORT_ROWS = 'Файл содержит больше {} строк!'
+INVITE_IMPORT_FORMATS = ('.csv', '.jsonl')
 
 
-async def send_invite_email(email: str, code: str) -> None:
-    await mail.send_message(
-        MessageSchema(
-            subject=SUBJECT,
-            recipients=[email],
-            body=BODY_TEMPLATE.format(code=code, invite_link=INVITE_LINK_TEMPLATE.format(code=code)),
-            subtype='html',
-        )
+def build_invite_email(email: str, code: str) -> MailCreate:
+    return MailCreate(
+        recipient=email,
+        subject=SUBJECT,
+        body=BODY_TEMPLATE.format(code=code, invite_link=INVITE_LINK_TEMPLATE.format(code=code)),
     )
 
 
-async def generate_invite_code(session: AsyncSession) -> str:
+def random_invite_code() -> str:
+    return ''.join(choice(INVITE_CODE_CHARS) for _ in range(INVITE_CODE_LENGTH))
+
+
+def random_invite_codes(count: int) -> list[str]:
+    codes = set()
+    while len(codes) < count:
+        codes.add(random_invite_code())
+    return list(codes)
+
+
+async def create_invites(items: list[InviteCreate], company_id: int, session: AsyncSession) -> list[Invite]:
+    invites = []
     for _ in range(MAX_INVITE_CODE_ATTEMPTS):
-        code = ''.join(choices(INVITE_CODE_CHARS, k=INVITE_CODE_LENGTH))
-        if await invites_crud.get_by_attribute('code', code, session) is None:
-            return code
+        codes = random_invite_codes(len(items))
+        created = await invites_crud.create_multi(items, codes, company_id, session)
+        invites += created
+        used = {invite.code for invite in created}
+        items = [item for item, code in zip(items, codes) if code not in used]
+        if not items:
+            return invites
     raise HTTPException(status_code=HTTPStatus.INTERNAL_SERVER_ERROR, detail=CODE_GENERATION_FAILED)
+
+
+def read_invite_records(lines, suffix: str):
+    if suffix == '.csv':
+        for row, record in enumerate(csv.DictReader(lines), start=2):
+            yield row, {key: value or None for key, value in record.items()}
+        return
+    for row, line in enumerate(lines, start=1):
+        if line.strip():
+            yield row, line
+
+
+def parse_invite_file(file: BinaryIO, filename: str | None) -> tuple[dict[int, InviteCreate], dict[int, str]]:
+    suffix = Path(filename or '').suffix.lower()
+    if suffix not in INVITE_IMPORT_FORMATS:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail=UNSUPPORTED_IMPORT_FORMAT.format(', '.join(INVITE_IMPORT_FORMATS)),
+        )
+    validate = InviteCreate.model_validate if suffix == '.csv' else InviteCreate.model_validate_json
+    lines = TextIOWrapper(file, encoding='utf-8-sig', newline='')
+    items, errors = {}, {}
+    try:
+        for row, record in read_invite_records(lines, suffix):
+            if len(items) + len(errors) >= MAX_INVITE_IMPORT_ROWS:
+                raise HTTPException(
+                    status_code=HTTPStatus.BAD_REQUEST, detail=TOO_MANY_IMPORT_ROWS.format(MAX_INVITE_IMPORT_ROWS)
+                )
+            try:
+                items[row] = validate(record)
+            except ValidationError as error:
+                errors[row] = '; '.join(detail['msg'] for detail in error.errors())
+    except (UnicodeDecodeError, csv.Error) as error:
+        raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail=str(error))
+    finally:
+        lines.detach()
+    return items, errors
+
+
+async def process_invite_import(job: InviteImport, session: AsyncSession) -> None:
+    finished = False
+    try:
+        while job.position < len(job.items):
+            chunk = job.items[job.position : job.position + INVITE_IMPORT_CHUNK]
+            invites = await create_invites(
+                [InviteCreate.model_validate(item) for item in chunk], job.company_id, session
+            )
+            await mail_outbox_crud.create_multi(
+                [build_invite_email(invite.email, invite.code) for invite in invites], session
+            )
+            job.position += len(chunk)
+            job.processed += len(chunk)
+            job.created += len(invites)
+            job.lease_until = datetime.now() + timedelta(seconds=INVITE_IMPORT_LEASE)
+            await session.commit()
+        job.status = ImportStatus.DONE
+        finished = True
+    except Exception as error:
+        await session.rollback()
+        await session.refresh(job)
+        reason = error.detail if isinstance(error, HTTPException) else str(error)
+        job.status = ImportStatus.FAILED
+        job.errors = [*job.errors, *(dict(row=item['row'], reason=reason) for item in job.items[job.position :])]
+        finished = True
+    finally:
+        if finished:
+            job.items = []
+            job.lease_until = None
+            job.finished_at = datetime.now()
+            await session.commit()
+
+
+async def run_invite_import_worker() -> None:
+    while True:
+        async with AsyncSessionLocal() as session:
+            job = await invite_import_crud.claim(session)
+            if job is not None:
+                await process_invite_import(job, session)
+        if job is None:
+            await asyncio.sleep(INVITE_IMPORT_POLL_INTERVAL)
+
+
+if __name__ == '__main__':
+    asyncio.run(run_invite_import_worker())
@@ -0,0 +1,61 @@
+import asyncio
+from email.message import EmailMessage
+from email.utils import formataddr
+
+from aiosmtplib import SMTPException
+from fastapi_mail.connection import Connection
+from fastapi_mail.errors import ConnectionErrors
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.base import Base  # noqa
+from app.core.config import settings
+from app.core.db import AsyncSessionLocal
+from app.core.mail import mail
+from app.crud.mail import mail_outbox_crud
+from app.models.mail import MailOutbox
+
+
+def build_message(email: MailOutbox) -> EmailMessage:
+    message = EmailMessage()
+    message['From'] = formataddr((settings.mail_from_name, settings.mail_from))
+    message['To'] = email.recipient
+    message['Subject'] = email.subject
+    message.set_content(email.body, subtype='html')
+    return message
+
+
+async def send_batch(emails: list[MailOutbox]) -> tuple[list[int], dict[int, str]]:
+    sent, failed = [], {}
+    try:
+        async with Connection(mail.config) as connection:
+            for email in emails:
+                try:
+                    await connection.session.send_message(build_message(email))
+                    sent.append(email.id)
+                except SMTPException as error:
+                    failed[email.id] = str(error)
+    except (ConnectionErrors, SMTPException) as error:
+        failed |= {email.id: str(error) for email in emails if email.id not in sent and email.id not in failed}
+    return sent, failed
+
+
+async def deliver_batch(session: AsyncSession) -> int:
+    emails = await mail_outbox_crud.claim(settings.mail_outbox_batch_size, session)
+    if not emails:
+        return 0
+    sent, failed = await send_batch(emails)
+    await mail_outbox_crud.mark_sent(sent, session)
+    await mail_outbox_crud.mark_failed(failed, session)
+    return len(emails)
+
+
+async def run_mail_worker() -> None:
+    while True:
+        async with AsyncSessionLocal() as session:
+            claimed = await deliver_batch(session)
+        if claimed < settings.mail_outbox_batch_size:
+            await asyncio.sleep(settings.mail_outbox_poll_interval)
+
+
+if __name__ == '__main__':
+    asyncio.run(run_mail_worker())
@@ -0,0 +1,17 @@
+import asyncio
+from argparse import ArgumentParser
+
+from app.core.base import Base  # noqa
+from app.core.db import AsyncSessionLocal
+from app.crud.motivation import rating_rollup_crud
+
+
+async def rebuild_rating_rollups(company_id: int | None = None) -> None:
+    async with AsyncSessionLocal() as session:
+        await rating_rollup_crud.rebuild(session, company_id)
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description='Пересчёт квартальных агрегатов оценок')
+    parser.add_argument('--company-id', type=int, default=None)
+    asyncio.run(rebuild_rating_rollups(parser.parse_args().company_id))
@@ -0,0 +1,19 @@
+from datetime import datetime, timedelta
+
+
+def find_free_slots(
+    busy: list[tuple[datetime, datetime]], start: datetime, end: datetime, duration: timedelta, limit: int
+) -> list[tuple[datetime, datetime]]:
+    slots = []
+    free_from = start
+    for busy_start, busy_end in busy:
+        if busy_start - free_from >= duration:
+            slots.append((free_from, busy_start))
+            if len(slots) == limit:
+                return slots
+        free_from = max(free_from, busy_end)
+        if free_from >= end:
+            return slots
+    if end - free_from >= duration:
+        slots.append((free_from, end))
+    return slots
@@ -1,7 +1,17 @@
+import logging
+from time import perf_counter
+
 from app.core.db import AsyncSessionLocal
 from app.crud.company import invites_crud
 
+INVITES_CLEANED = 'Удалено просроченных приглашений: %d за %.2f с'
+
+logger = logging.getLogger('uvicorn.error')
+
 
-async def cleanup_expired_invites_task() -> None:
+async def cleanup_expired_invites_task() -> int:
+    started = perf_counter()
     async with AsyncSessionLocal() as session:
-        await invites_crud.cleanup_expired_invites(session)
+        deleted = await invites_crud.cleanup_expired_invites(session)
+    logger.info(INVITES_CLEANED, deleted, perf_counter() - started)
+    return deleted